@@ -0,0 +1,120 @@
+"""Cohort analytics: skill-gap distributions and per-student exports.
+
+Gaps (``industry_need_level - current_level``) are small integers, so a
+cohort of any size reduces to a count per (skill, level) pair. The database
+does that reduction in one GROUP BY; everything here works on those few
+hundred rows, and percentiles read off the histogram are exact.
+"""
+import csv
+import io
+import json
+
+PERCENTILES = (10, 25, 50, 75, 90)
+EXPORT_COLUMNS = ('user_id', 'username', 'skill_id', 'skill', 'roadmap_group',
+                  'industry_need_level', 'current_level', 'gap', 'completed_activities')
+
+
+def histogram_percentile(histogram, pct):
+    """Nearest-rank percentile of a {value: count} histogram."""
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = max(1, -(-pct * total // 100))
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= rank:
+            return value
+
+
+class GapStats:
+    """Running gap histogram and completion totals for one slice of the cohort."""
+
+    def __init__(self):
+        self.histogram = {}
+        self.rows = 0
+        self.started = 0
+        self.completed = 0
+
+    def add(self, gap, rows, started, completed):
+        self.histogram[gap] = self.histogram.get(gap, 0) + rows
+        self.rows += rows
+        self.started += started
+        self.completed += completed
+
+    @property
+    def mean_gap(self):
+        return sum(gap * count for gap, count in self.histogram.items()) / self.rows if self.rows else None
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'gap': {
+                'mean': round(self.mean_gap, 3) if self.rows else None,
+                'percentiles': {f'p{pct}': histogram_percentile(self.histogram, pct) for pct in PERCENTILES},
+                'histogram': {str(gap): self.histogram[gap] for gap in sorted(self.histogram)},
+            },
+            'completion_rate': round(self.started / self.rows, 4) if self.rows else None,
+            'avg_completed_activities': round(self.completed / self.rows, 3) if self.rows else None,
+        }
+
+
+def cohort_report(level_counts, catalog, lagging=5):
+    """Build the per-roadmap-group report.
+
+    ``level_counts`` yields ``(skill_id, current_level, rows, started, completed)``
+    where ``started`` counts rows with at least one completed activity and
+    ``completed`` sums completed activities; ``catalog`` is a SkillCatalog.
+    """
+    overall, groups, skills = GapStats(), {}, {}
+    for skill_id, level, rows, started, completed in level_counts:
+        skill = catalog.by_id.get(skill_id)
+        if skill is None:
+            continue
+        gap = skill.industry_need_level - level
+        for stats in (overall, groups.setdefault(skill.roadmap_group, GapStats()), skills.setdefault(skill_id, GapStats())):
+            stats.add(gap, rows, started or 0, completed or 0)
+
+    report = {'overall': overall.as_dict(), 'groups': {}}
+    for group, stats in sorted(groups.items()):
+        ranked = sorted((skill_id for skill_id in skills if catalog.by_id[skill_id].roadmap_group == group),
+                        key=lambda skill_id: skills[skill_id].mean_gap, reverse=True)
+        report['groups'][group] = dict(stats.as_dict(), lagging_skills=[{
+            'skill_id': skill_id,
+            'name': catalog.by_id[skill_id].name,
+            'mean_gap': round(skills[skill_id].mean_gap, 3),
+            'rows': skills[skill_id].rows,
+            'completion_rate': round(skills[skill_id].started / skills[skill_id].rows, 4),
+        } for skill_id in ranked[:lagging]])
+    return report
+
+
+def export_rows(rows):
+    """Turn (user_id, username, skill_id, skill, group, need, level, completed) rows into export records."""
+    for user_id, username, skill_id, skill, group, need, level, completed in rows:
+        yield (user_id, username, skill_id, skill, group, need, level, need - level, completed or 0)
+
+
+def csv_lines(records):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for record in records:
+        writer.writerow(record)
+        # Flush in ~64 KiB pieces rather than one tiny chunk per row.
+        if buffer.tell() > 65536:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_lines(records):
+    lines = []
+    for record in records:
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, record))))
+        if len(lines) >= 1000:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
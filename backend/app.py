@@ -1,24 +1,52 @@
-from flask import Flask, render_template, request, redirect, url_for, jsonify
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 from flask_login import LoginManager, login_user, current_user, logout_user, UserMixin, login_required
-from sqlalchemy import func
+from functools import wraps
+from sqlalchemy import func, case, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+import json
 import os
+import threading
 import requests
+import analytics
+import db_config
+from catalog import ACTIVITIES, ICONS, ROADMAP_GROUPS, SkillCatalog, SkillRecord, catalog_rows, catalog_version
+from chat_cache import ChatCache
+from gemini_client import GeminiClient, UpstreamBusy, UpstreamError, response_text
+from hashing import HashingBusy, PasswordHasher
+from instrumentation import Metrics
 
 app = Flask(__name__)
 
 # CONFIGURATION
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///skillsync.db'
+db_config.configure_database(app)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'your_secure_key' 
+app.config['STAFF_EMAILS'] = {e.strip().lower() for e in os.environ.get('STAFF_EMAILS', '').split(',') if e.strip()}
 
 db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
+with app.app_context():
+    db_config.install_sqlite_pragmas(db.engine)
+password_hasher = PasswordHasher.from_env()
+metrics = Metrics.from_env()
 login_manager = LoginManager(app)
 login_manager.login_view = 'register_page'
 login_manager.login_message_category = 'info'
 
+def staff_required(view):
+    """Like login_required, but only for accounts listed in STAFF_EMAILS."""
+    @wraps(view)
+    @login_required
+    def wrapper(*args, **kwargs):
+        if current_user.email.lower() not in app.config['STAFF_EMAILS']:
+            return jsonify({"error": "Staff only"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -34,17 +62,37 @@ class User(db.Model, UserMixin):
 class Skill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), unique=True, nullable=False)
-    category = db.Column(db.String(50), nullable=False)
+    category = db.Column(db.String(50), nullable=False, index=True)
     industry_need_level = db.Column(db.Integer, nullable=False)
-    roadmap_group = db.Column(db.String(100), nullable=True)
+    roadmap_group = db.Column(db.String(100), nullable=True, index=True)
 
 class StudentSkill(db.Model):
+    # The unique (user_id, skill_id) index also serves every lookup by user_id.
+    # The skill-side index covers the cohort analytics GROUP BY, so it never touches the table.
+    __table_args__ = (db.Index('uq_student_skill_user_skill', 'user_id', 'skill_id', unique=True),
+                      db.Index('ix_student_skill_skill_level', 'skill_id', 'current_level', 'completed_activities_count'))
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), nullable=False)
     current_level = db.Column(db.Integer, nullable=False)
     completed_activities_count = db.Column(db.Integer, default=0) 
 
+class SkillGapSummary(db.Model):
+    """Running totals behind the dashboard gap, one row per user and skill category.
+
+    Kept in step with StudentSkill incrementally: every level write locks the
+    user's rows, then adds its own deltas in the same transaction.
+    """
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    category = db.Column(db.String(50), primary_key=True)
+    need_sum = db.Column(db.Integer, nullable=False, default=0)
+    level_sum = db.Column(db.Integer, nullable=False, default=0)
+    skill_count = db.Column(db.Integer, nullable=False, default=0)
+
+class CatalogMeta(db.Model):
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.String(200), nullable=False)
+
 class Feedback(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     student_name = db.Column(db.String(100), nullable=False)
@@ -52,36 +100,291 @@ class Feedback(db.Model):
     message = db.Column(db.Text, nullable=False)
 
 # --- DATA SEEDING ---
+SKILL_FIELDS = ('category', 'industry_need_level', 'roadmap_group')
+
 def seed_database():
-    ROADMAP_DATA = {
-        'Web Developer': [{'name': 'HTML & CSS', 'industryNeed': 4}, {'name': 'JavaScript', 'industryNeed': 5}, {'name': 'Git & GitHub', 'industryNeed': 4}, {'name': 'Frontend Framework (React/Vue)', 'industryNeed': 5}, {'name': 'Backend Language (Python/Node)', 'industryNeed': 4}, {'name': 'Database (SQL/NoSQL)', 'industryNeed': 3}, {'name': 'APIs (RESTful)', 'industryNeed': 4}, {'name': 'Deployment (Cloud/Hosting)', 'industryNeed': 3}],
-        'Data Scientist': [{'name': 'Probability & Statistics', 'industryNeed': 4}, {'name': 'Python (Pandas, NumPy)', 'industryNeed': 5}, {'name': 'SQL', 'industryNeed': 4}, {'name': 'Data Cleaning & Preprocessing', 'industryNeed': 4}, {'name': 'Machine Learning', 'industryNeed': 5}, {'name': 'Data Visualization', 'industryNeed': 3}, {'name': 'Big Data (Spark/Hadoop)', 'industryNeed': 2}, {'name': 'Deployment (APIs/Cloud)', 'industryNeed': 3}],
-        'Cybersecurity Analyst': [{'name': 'Computer Fundamentals', 'industryNeed': 3}, {'name': 'Linux & Networking', 'industryNeed': 4}, {'name': 'Python for Automation', 'industryNeed': 3}, {'name': 'Security Tools (Nmap, Wireshark)', 'industryNeed': 4}, {'name': 'Web Security (OWASP)', 'industryNeed': 5}, {'name': 'Penetration Testing Basics', 'industryNeed': 4}, {'name': 'SOC/Blue Team Basics', 'industryNeed': 3}],
-        'App Developer': [{'name': 'Java or Kotlin', 'industryNeed': 4}, {'name': 'Android Studio', 'industryNeed': 4}, {'name': 'UI/UX basics', 'industryNeed': 3}, {'name': 'Android components', 'industryNeed': 4}, {'name': 'Databases (Room, SQLite)', 'industryNeed': 3}, {'name': 'API integration', 'industryNeed': 4}, {'name': 'Firebase', 'industryNeed': 3}],
-        'Cloud Engineer': [{'name': 'Linux basics', 'industryNeed': 3}, {'name': 'Networking (VPC, Subnets)', 'industryNeed': 4}, {'name': 'Cloud provider (AWS/Azure/GCP)', 'industryNeed': 5}, {'name': 'IAM', 'industryNeed': 4}, {'name': 'Compute (EC2, VM)', 'industryNeed': 5}, {'name': 'Storage (S3/Blob)', 'industryNeed': 3}, {'name': 'Databases (RDS, DynamoDB)', 'industryNeed': 3}, {'name': 'Monitoring & Security', 'industryNeed': 4}],
-        'AI/ML Engineer': [{'name': 'Python (Adv. Libraries)', 'industryNeed': 4}, {'name': 'Stats & Probability', 'industryNeed': 4}, {'name': 'ML Algorithms', 'industryNeed': 5}, {'name': 'Deep Learning (TensorFlow/PyTorch)', 'industryNeed': 5}, {'name': 'Data Engineering basics', 'industryNeed': 3}, {'name': 'NLP / CV', 'industryNeed': 4}, {'name': 'Deployment (Docker, APIs)', 'industryNeed': 4}],
-        'UI/UX Designer': [{'name': 'Design principles', 'industryNeed': 4}, {'name': 'Figma', 'industryNeed': 5}, {'name': 'Typography & Color Theory', 'industryNeed': 3}, {'name': 'Wireframes', 'industryNeed': 3}, {'name': 'Prototypes', 'industryNeed': 4}, {'name': 'User research', 'industryNeed': 4}, {'name': 'Portfolio building', 'industryNeed': 3}],
-        'Ethical Hacker': [{'name': 'Linux fundamentals', 'industryNeed': 4}, {'name': 'Networking basics', 'industryNeed': 4}, {'name': 'Security concepts (CIA triad, attacks)', 'industryNeed': 5}, {'name': 'Kali Linux tools', 'industryNeed': 5}, {'name': 'Vulnerability scanning', 'industryNeed': 4}, {'name': 'Metasploit basics', 'industryNeed': 3}, {'name': 'Reporting & documentation', 'industryNeed': 3}],
-        'Data Analyst': [{'name': 'Excel fundamentals', 'industryNeed': 4}, {'name': 'SQL basics (joins, subqueries)', 'industryNeed': 5}, {'name': 'Visualization tools (Power BI/Tableau)', 'industryNeed': 4}, {'name': 'Reports & dashboards', 'industryNeed': 3}, {'name': 'Basic analytics case studies', 'industryNeed': 3}],
-        'Full Stack Developer': [{'name': 'HTML & CSS', 'industryNeed': 4}, {'name': 'JavaScript', 'industryNeed': 5}, {'name': 'Frontend Framework (React/Vue)', 'industryNeed': 5}, {'name': 'Backend Language (Node.js / Python)', 'industryNeed': 4}, {'name': 'Database (SQL/NoSQL)', 'industryNeed': 4}, {'name': 'APIs + Authentication', 'industryNeed': 4}, {'name': 'Deployment (Render, Vercel, AWS)', 'industryNeed': 4}]
-    }
+    """Bring the Skill table in line with the catalog; returns False when it already was.
+
+    The catalog hash is stored in CatalogMeta, so an unchanged catalog costs a
+    single primary-key read. Otherwise the diff is applied with one bulk read,
+    one bulk insert and one bulk update. Skills are never deleted.
+    """
+    rows = catalog_rows()
+    version = catalog_version(rows)
     with app.app_context():
-        for role, skills in ROADMAP_DATA.items():
-            for skill_data in skills:
-                existing = Skill.query.filter_by(name=skill_data['name']).first()
-                if not existing:
-                    db.session.add(Skill(name=skill_data['name'], category='Technical', industry_need_level=skill_data['industryNeed'], roadmap_group=role))
-        soft_skills = ['Communication Skills', 'Time Management', 'Public Speaking', 'Teamwork Skills', 'Critical Thinking', 'Leadership Skills', 'Creativity', 'Problem Solving', 'Emotional Intelligence']
-        for name in soft_skills:
-            if not Skill.query.filter_by(name=name).first():
-                db.session.add(Skill(name=name, category='Soft', industry_need_level=5, roadmap_group='General'))
-        db.session.commit()
+        stored = db.session.get(CatalogMeta, 'catalog_version')
+        if stored and stored.value == version:
+            return False
+        existing = {row.name: row for row in db.session.execute(select(Skill.id, Skill.name, *[getattr(Skill, f) for f in SKILL_FIELDS]))}
+        inserts = [row for row in rows if row['name'] not in existing]
+        updates = [dict(row, id=existing[row['name']].id) for row in rows if row['name'] in existing
+                   and any(getattr(existing[row['name']], f) != row[f] for f in SKILL_FIELDS)]
+        try:
+            if inserts: db.session.execute(insert(Skill), inserts)
+            if updates: db.session.execute(update(Skill), updates)
+            db.session.merge(CatalogMeta(key='catalog_version', value=version))
+            db.session.commit()
+        except IntegrityError:
+            # Another worker booted at the same moment and seeded first.
+            db.session.rollback()
+            return False
+        skill_catalog.invalidate()
+        if updates:
+            # Industry need levels feed the dashboard totals.
+            rebuild_gap_summaries()
+        app.logger.info('Skill catalog seeded: %d added, %d updated', len(inserts), len(updates))
+        return True
+
+# --- SKILL CATALOG ---
+class SkillCatalogCache:
+    """This worker's SkillCatalog snapshot.
+
+    The stored catalog version is re-read at most every CATALOG_CHECK_SECONDS;
+    the snapshot is rebuilt only when that version has changed.
+    """
+
+    def __init__(self, check_seconds):
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._catalog = None
+
+    def get(self):
+        catalog, now = self._catalog, time.monotonic()
+        if catalog is not None and now - self._checked_at < self.check_seconds:
+            return catalog
+        with self._lock:
+            if self._catalog is None or now - self._checked_at >= self.check_seconds:
+                version = db.session.query(CatalogMeta.value).filter_by(key='catalog_version').scalar()
+                if self._catalog is None or self._catalog.version != version:
+                    rows = db.session.execute(select(Skill.id, Skill.name, Skill.category, Skill.industry_need_level, Skill.roadmap_group))
+                    self._catalog = SkillCatalog([SkillRecord(*row) for row in rows], version)
+                self._checked_at = now
+            return self._catalog
+
+skill_catalog = SkillCatalogCache(float(os.environ.get('CATALOG_CHECK_SECONDS', 60)))
+
+# --- PROGRESS QUERIES ---
+def load_skill_progress(user_id, category):
+    """Every catalog skill in a category with the user's level and completion count (one query)."""
+    progress = {skill_id: (level, completed) for skill_id, level, completed in db.session.execute(
+        select(StudentSkill.skill_id, StudentSkill.current_level, StudentSkill.completed_activities_count)
+        .where(StudentSkill.user_id == user_id))}
+    skill_data = []
+    for skill in skill_catalog.get().in_category(category):
+        level, completed = progress.get(skill.id, (None, None))
+        skill_data.append({
+            'id': skill.id, 'name': skill.name, 'industryNeed': skill.industry_need_level,
+            'currentLevel': level if level is not None else 1,
+            'completedCount': completed or 0,
+            'roadmapGroup': skill.roadmap_group
+        })
+    return skill_data
+
+def upsert_insert(model):
+    """INSERT construct that supports ON CONFLICT for the configured database."""
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(model)
+
+def upsert_skill_levels(user_id, levels):
+    """Write {skill_id: level} for a user with one batched upsert; ids missing from the catalog are skipped."""
+    known = skill_catalog.get().by_id
+    rows = [{'user_id': user_id, 'skill_id': skill_id, 'current_level': level, 'completed_activities_count': 0}
+            for skill_id, level in levels.items() if skill_id in known]
+    if not rows: return 0
+    before = lock_gap_summaries(user_id, [row['skill_id'] for row in rows])
+    stmt = upsert_insert(StudentSkill).values(rows)
+    stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'skill_id'],
+                                      set_={'current_level': stmt.excluded.current_level})
+    db.session.execute(stmt)
+    apply_gap_deltas(user_id, before, {row['skill_id']: row['current_level'] for row in rows})
+    return len(rows)
+
+MAX_ACTIVITY_EVENTS = 100
+# A page has one button per activity, so one flush never carries more clicks per skill than this.
+MAX_ACTIVITY_COUNT = max(len(activities) for activities in ACTIVITIES.values())
+
+def record_activity_completions(user_id, counts):
+    """Add {skill_id: completed activities} for a user in one upsert.
+
+    Counts and levels are incremented in SQL, so concurrent requests cannot
+    lose an update. Every third completed activity raises the level, up to 5.
+    Returns {skill_id: (current_level, completed_activities_count)}.
+    """
+    if not counts: return {}
+    before = lock_gap_summaries(user_id, counts)
+    rows = [{'user_id': user_id, 'skill_id': skill_id, 'completed_activities_count': count,
+             'current_level': min(5, 1 + count // 3)} for skill_id, count in counts.items()]
+    stmt = upsert_insert(StudentSkill).values(rows)
+    done = func.coalesce(StudentSkill.completed_activities_count, 0)
+    added = stmt.excluded.completed_activities_count
+    raised = StudentSkill.current_level + ((done + added) // 3 - done // 3)
+    stmt = stmt.on_conflict_do_update(index_elements=['user_id', 'skill_id'], set_={
+        'completed_activities_count': done + added,
+        'current_level': case((raised > 5, 5), else_=raised),
+    })
+    db.session.execute(stmt)
+    result = db.session.execute(select(StudentSkill.skill_id, StudentSkill.current_level, StudentSkill.completed_activities_count)
+                                .where(StudentSkill.user_id == user_id, StudentSkill.skill_id.in_(counts)))
+    saved = {skill_id: (level, completed) for skill_id, level, completed in result}
+    apply_gap_deltas(user_id, before, {skill_id: level for skill_id, (level, _) in saved.items()})
+    return saved
+
+# --- GAP SUMMARIES ---
+def gap_totals_query(user_id=None):
+    """Live (user_id, category, need_sum, level_sum, skill_count) aggregate over StudentSkill."""
+    query = select(
+        StudentSkill.user_id, Skill.category,
+        func.sum(Skill.industry_need_level), func.sum(StudentSkill.current_level), func.count(StudentSkill.id)
+    ).join(Skill, Skill.id == StudentSkill.skill_id)
+    if user_id is not None:
+        query = query.where(StudentSkill.user_id == user_id)
+    return query.group_by(StudentSkill.user_id, Skill.category)
+
+GAP_SUM_COLUMNS = ('need_sum', 'level_sum', 'skill_count')
+
+def lock_gap_summaries(user_id, skill_ids):
+    """Lock the user's summary rows for these skills' categories; returns {skill_id: current_level}.
+
+    Call before writing StudentSkill. The no-op upsert creates missing rows
+    and holds their row locks on PostgreSQL, or the database write lock on
+    SQLite, until commit. A concurrent write for the same user therefore
+    waits here and then reads the levels this one committed.
+    """
+    catalog = skill_catalog.get().by_id
+    categories = sorted({catalog[skill_id].category for skill_id in skill_ids})
+    stmt = upsert_insert(SkillGapSummary).values([
+        {'user_id': user_id, 'category': category, 'need_sum': 0, 'level_sum': 0, 'skill_count': 0}
+        for category in categories])
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['user_id', 'category'],
+                                                  set_={'skill_count': SkillGapSummary.skill_count}))
+    return dict(db.session.execute(select(StudentSkill.skill_id, StudentSkill.current_level)
+                                   .where(StudentSkill.user_id == user_id, StudentSkill.skill_id.in_(skill_ids))).all())
+
+def apply_gap_deltas(user_id, before, after):
+    """Add the change from {skill_id: level} ``before`` (existing rows only) to ``after`` to the summaries."""
+    catalog = skill_catalog.get().by_id
+    deltas = {}
+    for skill_id, level in after.items():
+        skill = catalog[skill_id]
+        delta = deltas.setdefault(skill.category, [0, 0, 0])
+        if skill_id in before:
+            delta[1] += level - before[skill_id]
+        else:
+            delta[0] += skill.industry_need_level
+            delta[1] += level
+            delta[2] += 1
+    rows = [dict(zip(GAP_SUM_COLUMNS, delta), user_id=user_id, category=category)
+            for category, delta in deltas.items() if any(delta)]
+    if not rows: return
+    stmt = upsert_insert(SkillGapSummary).values(rows)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=['user_id', 'category'], set_={
+        name: getattr(SkillGapSummary, name) + getattr(stmt.excluded, name) for name in GAP_SUM_COLUMNS}))
+
+def rebuild_gap_summaries():
+    """Recompute every summary row from scratch; returns the number of rows written."""
+    db.session.query(SkillGapSummary).delete()
+    columns = ['user_id', 'category', 'need_sum', 'level_sum', 'skill_count']
+    db.session.execute(SkillGapSummary.__table__.insert().from_select(columns, gap_totals_query()))
+    db.session.commit()
+    return SkillGapSummary.query.count()
+
+def check_gap_summaries():
+    """Compare stored summaries with the live aggregate; returns a list of mismatch descriptions."""
+    live = {(u, c): (n, l, k) for u, c, n, l, k in db.session.execute(gap_totals_query())}
+    stored = {(r.user_id, r.category): (r.need_sum, r.level_sum, r.skill_count) for r in SkillGapSummary.query}
+    return [f'user {u} {c}: stored {stored.get((u, c))}, live {live.get((u, c))}'
+            for u, c in sorted(live.keys() | stored.keys()) if live.get((u, c)) != stored.get((u, c))]
+
+# --- COHORT ANALYTICS ---
+ANALYTICS_EXPORT_BATCH = 5000
+
+def cohort_level_counts(roadmap_group=None):
+    """(skill_id, current_level, rows, started, completed) for the whole cohort, aggregated in SQL."""
+    query = select(
+        StudentSkill.skill_id, StudentSkill.current_level, func.count(),
+        func.sum(case((StudentSkill.completed_activities_count > 0, 1), else_=0)),
+        func.sum(StudentSkill.completed_activities_count)
+    ).group_by(StudentSkill.skill_id, StudentSkill.current_level)
+    if roadmap_group:
+        skill_ids = [skill.id for skill in skill_catalog.get().by_roadmap_group.get(roadmap_group, ())]
+        query = query.where(StudentSkill.skill_id.in_(skill_ids))
+    return db.session.execute(query)
+
+def cohort_export_rows(roadmap_group=None):
+    """Per-student gap rows in (user_id, skill_id) index order, fetched in batches."""
+    query = select(
+        StudentSkill.user_id, User.username, Skill.id, Skill.name, Skill.roadmap_group,
+        Skill.industry_need_level, StudentSkill.current_level, StudentSkill.completed_activities_count
+    ).join(User, User.id == StudentSkill.user_id).join(Skill, Skill.id == StudentSkill.skill_id
+    ).order_by(StudentSkill.user_id, StudentSkill.skill_id).execution_options(yield_per=ANALYTICS_EXPORT_BATCH)
+    if roadmap_group:
+        query = query.where(Skill.roadmap_group == roadmap_group)
+    return db.session.execute(query)
+
+# --- FEEDBACK QUERIES ---
+FEEDBACK_PAGE_SIZE = 12
+FEEDBACK_LATEST_COUNT = 3
+
+def feedback_dict(review):
+    return {'id': review.id, 'student_name': review.student_name, 'rating': review.rating, 'message': review.message}
+
+def feedback_page(before=None, limit=FEEDBACK_PAGE_SIZE):
+    """Newest-first page of reviews older than id ``before``, plus the cursor for the next page."""
+    query = Feedback.query.order_by(Feedback.id.desc())
+    if before is not None:
+        query = query.filter(Feedback.id < before)
+    rows = query.limit(limit + 1).all()
+    next_before = rows[limit - 1].id if len(rows) > limit else None
+    return [feedback_dict(r) for r in rows[:limit]], next_before
+
+class FeedbackSummaryCache:
+    """Review count, average, rating histogram and latest reviews, rebuilt only when feedback changes.
+
+    The newest feedback id acts as the version, so a submit handled by another
+    worker is noticed with a single primary-key lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._summary = None
+
+    def invalidate(self):
+        with self._lock:
+            self._summary = None
+
+    def get(self):
+        version = db.session.query(func.max(Feedback.id)).scalar()
+        with self._lock:
+            if self._summary is not None and self._version == version:
+                return self._summary
+        summary = self._build()
+        with self._lock:
+            self._version, self._summary = version, summary
+        return summary
+
+    def _build(self):
+        histogram = {rating: 0 for rating in range(1, 6)}
+        for rating, count in db.session.query(Feedback.rating, func.count(Feedback.id)).group_by(Feedback.rating):
+            histogram[rating] = count
+        total = sum(histogram.values())
+        average = sum(rating * count for rating, count in histogram.items()) / total if total else None
+        latest, _ = feedback_page(limit=FEEDBACK_LATEST_COUNT)
+        return {'count': total, 'average': round(average, 1) if average is not None else None,
+                'histogram': histogram, 'latest': latest}
+
+feedback_summary = FeedbackSummaryCache()
 
 # --- ROUTES ---
 @app.route('/')
 def home():
     try:
-        feedbacks = Feedback.query.order_by(Feedback.id.desc()).limit(3).all()
+        feedbacks = feedback_summary.get()['latest']
     except:
         feedbacks = []
     return render_template('index.html', feedbacks=feedbacks)
@@ -97,7 +400,7 @@ def register():
     password = request.form.get('password')
     if User.query.filter((User.email == email) | (User.username == username)).first():
         return redirect(url_for('register_page'))
-    hashed_pw = bcrypt.generate_password_hash(password).decode('utf-8')
+    hashed_pw = password_hasher.hash(password)
     user = User(email=email, username=username, password_hash=hashed_pw)
     db.session.add(user)
     db.session.commit()
@@ -107,11 +410,22 @@ def register():
 @app.route('/login', methods=['POST'])
 def login():
     user = User.query.filter_by(email=request.form.get('email')).first()
-    if user and bcrypt.check_password_hash(user.password_hash, request.form.get('password')):
+    password = request.form.get('password') or ''
+    if user and password_hasher.verify(user.password_hash, password):
+        if password_hasher.needs_rehash(user.password_hash):
+            # The configured cost changed since this hash was made; upgrade it while we have the password.
+            user.password_hash = password_hasher.hash(password)
+            db.session.commit()
         login_user(user) 
         return redirect(url_for('dashboard'))
     return redirect(url_for('register_page'))
 
+@app.errorhandler(HashingBusy)
+def hashing_busy(e):
+    response = jsonify({"error": "Too many sign-ins at once. Please try again in a moment."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @app.route('/logout')
 def logout():
     logout_user()
@@ -120,44 +434,43 @@ def logout():
 @app.route('/dashboard')
 @login_required 
 def dashboard():
-    progress_query = db.session.query(
-        Skill.category,
-        (Skill.industry_need_level - func.avg(StudentSkill.current_level)).label('avg_gap')
-    ).join(StudentSkill).filter(StudentSkill.user_id == current_user.id).group_by(Skill.category).all()
     gaps = {'Technical': {'total_gap': 5, 'level': 0}, 'Soft': {'total_gap': 5, 'level': 0}, 'status_message': f'Welcome, {current_user.username}. Start your assessment.'}
-    for category, avg_gap in progress_query:
+    for summary in SkillGapSummary.query.filter_by(user_id=current_user.id):
+        if not summary.skill_count: continue
+        avg_gap = (summary.need_sum - summary.level_sum) / summary.skill_count
         current_lvl = max(0, 5 - round(avg_gap))
-        gaps[category] = {'total_gap': round(avg_gap, 1), 'level': current_lvl}
+        gaps[summary.category] = {'total_gap': round(avg_gap, 1), 'level': current_lvl}
     return render_template('dashboard.html', user_email=current_user.email, gaps=gaps, username=current_user.username)
 
 @app.route('/technical-roadmap.html')
 @login_required
 def technical_roadmap():
-    all_skills = Skill.query.filter_by(category='Technical').all()
-    skill_data = []
-    for s in all_skills:
-        u_skill = StudentSkill.query.filter_by(user_id=current_user.id, skill_id=s.id).first()
-        skill_data.append({
-            'id': s.id, 'name': s.name, 'industryNeed': s.industry_need_level,
-            'currentLevel': u_skill.current_level if u_skill else 1,
-            'completedCount': u_skill.completed_activities_count if u_skill else 0,
-            'roadmapGroup': s.roadmap_group 
-        })
-    ROADMAP_GROUPS = ["Web Developer", "Cybersecurity Analyst", "Ethical Hacker", "AI/ML Engineer", "Data Scientist", "Data Analyst", "Cloud Engineer", "UI/UX Designer", "Full Stack Developer"]
-    return render_template('technical-roadmap.html', roadmap_groups=ROADMAP_GROUPS, skill_data=skill_data)
+    # Progress is fetched from /api/progress, so an unchanged payload is revalidated, not re-sent.
+    return render_template('technical-roadmap.html', roadmap_groups=ROADMAP_GROUPS)
+
+@app.route('/api/progress')
+@login_required
+def api_progress():
+    category = request.args.get('category', 'Technical')
+    if category not in ('Technical', 'Soft'):
+        return jsonify({"error": "Unknown category"}), 400
+    response = jsonify(load_skill_progress(current_user.id, category))
+    # Per-user payload: browsers may keep it but must revalidate with If-None-Match.
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
 
 @app.route('/save_skills', methods=['POST'])
 @login_required
 def save_skills():
+    levels = {}
     for key, value in request.form.items():
         if key.startswith('skill_'):
             try:
-                skill_id = int(key.split('_')[1])
                 level = int(value)
-                entry = StudentSkill.query.filter_by(user_id=current_user.id, skill_id=skill_id).first()
-                if entry: entry.current_level = level
-                else: db.session.add(StudentSkill(user_id=current_user.id, skill_id=skill_id, current_level=level))
+                if 1 <= level <= 5: levels[int(key.split('_')[1])] = level
             except ValueError: continue
+    upsert_skill_levels(current_user.id, levels)
     db.session.commit()
     return redirect(url_for('technical_roadmap'))
 
@@ -166,57 +479,88 @@ def save_skills():
 def mark_activity_complete():
     data = request.json
     skill_name = data.get('skill_name')
-    skill = Skill.query.filter_by(name=skill_name).first() 
+    skill = skill_catalog.get().by_name.get(skill_name)
     if not skill: return jsonify({"success": False, "message": "Skill not found"}), 404
-    entry = StudentSkill.query.filter_by(user_id=current_user.id, skill_id=skill.id).first()
-    if not entry:
-        entry = StudentSkill(user_id=current_user.id, skill_id=skill.id, current_level=1, completed_activities_count=1)
-        db.session.add(entry)
-    else:
-        entry.completed_activities_count += 1
-        if entry.current_level < 5 and entry.completed_activities_count % 3 == 0:
-             entry.current_level += 1
+    level, count = record_activity_completions(current_user.id, {skill.id: 1})[skill.id]
+    db.session.commit()
+    return jsonify({"success": True, "new_level": level, "count": count})
+
+@app.route('/mark_activity_complete/batch', methods=['POST'])
+@login_required
+def mark_activities_complete():
+    """Apply queued activity clicks: {"events": [{"skill_id" or "skill_name", "count"}, ...]}."""
+    events = (request.get_json(silent=True) or {}).get('events')
+    if not isinstance(events, list) or not 0 < len(events) <= MAX_ACTIVITY_EVENTS:
+        return jsonify({"success": False, "message": f"Send between 1 and {MAX_ACTIVITY_EVENTS} events"}), 400
+    if not all(isinstance(event, dict) for event in events):
+        return jsonify({"success": False, "message": "Each event must be an object"}), 400
+    catalog = skill_catalog.get()
+    counts, unknown = {}, []
+    for event in events:
+        skill_id, skill_name = event.get('skill_id'), event.get('skill_name')
+        skill = (catalog.by_id.get(skill_id) if isinstance(skill_id, int) and not isinstance(skill_id, bool) else None) or \
+                (catalog.by_name.get(skill_name) if isinstance(skill_name, str) else None)
+        count = event.get('count', 1)
+        if skill is None or not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_ACTIVITY_COUNT:
+            unknown.append(event)
+            continue
+        counts[skill.id] = counts.get(skill.id, 0) + count
+    saved = record_activity_completions(current_user.id, counts)
     db.session.commit()
-    return jsonify({"success": True, "new_level": entry.current_level, "count": entry.completed_activities_count})
+    return jsonify({"success": True, "unknown": unknown, "skills": [
+        {"skill_id": skill_id, "skill_name": catalog.by_id[skill_id].name, "new_level": level, "count": count}
+        for skill_id, (level, count) in saved.items()]})
 
 @app.route('/non-technical-activities.html')
 @login_required
 def non_tech():
-    soft_skills = Skill.query.filter_by(category='Soft').all()
-    soft_skill_data = []
-    for s in soft_skills:
-        u_skill = StudentSkill.query.filter_by(user_id=current_user.id, skill_id=s.id).first()
-        soft_skill_data.append({
-            'id': s.id, 'name': s.name, 'industryNeed': s.industry_need_level,
-            'currentLevel': u_skill.current_level if u_skill else 1,
-            'completedCount': u_skill.completed_activities_count if u_skill else 0
-        })
-    ACTIVITIES = {
-        'Communication Skills': ['Record a 1-minute self-intro', 'Read aloud for 3 minutes', 'Talk to one new person', 'Write a professional email', 'Explain a concept in simple words'],
-        'Time Management': ['Track your day for 24 hours', 'Make a to-do list', 'Complete 1 task using Pomodoro', 'Set top 3 priorities for tomorrow', 'Track actual study hours'],
-        'Public Speaking': ['Speak in front of a mirror for 1 minute', 'Record a short speech', 'Ask 1 question in public', 'Present something to a friend', 'Watch a TED talk'],
-        'Teamwork Skills': ['Complete 1 task with a partner', 'Give positive feedback', 'Delegate a task', 'Resolve a small conflict', 'Do a group mini-project'],
-        'Critical Thinking': ['Solve 1 puzzle/riddle', 'Do a root-cause analysis', 'Break a problem into steps', 'Compare two solutions', 'Solve a small case study'],
-        'Leadership Skills': ['Lead a small project', 'Assign tasks based on strengths', 'Give corrective feedback', 'Take responsibility for an outcome', 'Mentor a junior student'],
-        'Creativity': ['Generate 5 ideas for a problem', 'Make a mind map', 'Sketch a rough design', 'Try a rapid prototype', 'Combine 2 random concepts'],
-        'Problem Solving': ['Solve a logic puzzle', 'Break a real-life issue into steps', 'Test a solution and improve', 'Analyze why something failed', 'Compare outcomes of approaches'],
-        'Emotional Intelligence': ['Maintain a mood journal', 'Do a 5-min breathing session', 'Practice active listening', 'Write a reflection on emotions', 'Observe someone’s emotion']
-    }
-    ICONS = {'Communication Skills': '🗣', 'Time Management': '🕒', 'Public Speaking': '🎤', 'Teamwork Skills': '👥', 'Critical Thinking': '🧠', 'Leadership Skills': '🧑‍🏫', 'Creativity': '💡', 'Problem Solving': '🧩', 'Emotional Intelligence': '❤️'}
-    return render_template('non-technical-activities.html', soft_skill_data=soft_skill_data, ACTIVITIES=ACTIVITIES, ICONS=ICONS)
+    return render_template('non-technical-activities.html', ACTIVITIES=ACTIVITIES, ICONS=ICONS)
 
 @app.route('/save_soft_skills', methods=['POST'])
 @login_required
 def save_soft_skills():
     return redirect(url_for('non_tech'))
 
+@app.route('/api/analytics/cohort')
+@staff_required
+def cohort_analytics():
+    roadmap_group = request.args.get('roadmap_group')
+    lagging = min(max(request.args.get('lagging', 5, type=int), 1), 50)
+    return jsonify(analytics.cohort_report(cohort_level_counts(roadmap_group), skill_catalog.get(), lagging))
+
+@app.route('/api/analytics/export')
+@staff_required
+def cohort_export():
+    roadmap_group = request.args.get('roadmap_group')
+    fmt = request.args.get('format', 'csv')
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({"error": "format must be csv or jsonl"}), 400
+    records = analytics.export_rows(cohort_export_rows(roadmap_group))
+    lines = analytics.csv_lines(records) if fmt == 'csv' else analytics.jsonl_lines(records)
+    response = Response(stream_with_context(lines), mimetype='text/csv' if fmt == 'csv' else 'application/x-ndjson')
+    response.headers['Content-Disposition'] = f'attachment; filename=skillsync-gaps.{fmt}'
+    return response
+
 @app.route('/feedback.html')
 def feedback():
+    before = request.args.get('before', type=int)
     try:
-        feedbacks = Feedback.query.order_by(Feedback.id.desc()).all()
+        feedbacks, next_before = feedback_page(before)
+        summary = feedback_summary.get()
     except:
-        feedbacks = []
-    return render_template('feedback.html', feedbacks=feedbacks)
+        feedbacks, next_before, summary = [], None, None
+    return render_template('feedback.html', feedbacks=feedbacks, next_before=next_before, summary=summary, is_first_page=before is None)
+
+@app.route('/api/feedback')
+def api_feedback():
+    before = request.args.get('before', type=int)
+    limit = min(max(request.args.get('limit', FEEDBACK_PAGE_SIZE, type=int), 1), 50)
+    feedbacks, next_before = feedback_page(before, limit)
+    return jsonify({'items': feedbacks, 'next_before': next_before})
+
+@app.route('/api/feedback/summary')
+def api_feedback_summary():
+    return jsonify(feedback_summary.get())
 
 @app.route('/submit_feedback', methods=['GET', 'POST'])
 def submit_feedback():
@@ -227,6 +571,7 @@ def submit_feedback():
         new_feedback = Feedback(student_name=name, rating=int(rating), message=message)
         db.session.add(new_feedback)
         db.session.commit()
+        feedback_summary.invalidate()
         return redirect(url_for('feedback'))
     return render_template('submit_feedback.html')
 
@@ -235,39 +580,160 @@ def review_form():
     return redirect(url_for('submit_feedback'))
 
 # --- FINAL WORKING CHATBOT PROXY ---
-@app.route('/api/chat', methods=['POST'])
-def chat_proxy():
-    data = request.json
-    user_message = data.get('message', '')
-    
-    # --- FIXED: Securely get the key from Render Environment ---
-    API_KEY = os.environ.get("GEMINI_API_KEY")
-
-    if not API_KEY:
-        print("Error: GEMINI_API_KEY not found in environment variables")
-        return jsonify({"error": "Server Error: API Key not configured"}), 500
-    
-    # WE ARE USING THE MODEL YOU CONFIRMED WORKS
-    URL = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={API_KEY}"
-    
-    payload = {
+CHAT_SYSTEM_INSTRUCTION = "You are the helpful AI Guide for the SkillSync website. Your goal is to help students understand the platform."
+gemini = GeminiClient.from_env()
+chat_cache = ChatCache.from_env()
+
+def chat_payload(user_message):
+    return {
         "contents": [{"parts": [{"text": user_message}]}],
-        "systemInstruction": {"parts": [{"text": "You are the helpful AI Guide for the SkillSync website. Your goal is to help students understand the platform."}]} 
+        "systemInstruction": {"parts": [{"text": CHAT_SYSTEM_INSTRUCTION}]}
     }
-    
+
+def chat_cache_key(user_message):
+    return ChatCache.key(user_message, CHAT_SYSTEM_INSTRUCTION, gemini.model)
+
+def cached_chat_body(text):
+    """A generateContent-shaped body, so cached stream answers also serve /api/chat."""
+    return {"candidates": [{"content": {"parts": [{"text": text}], "role": "model"}}]}
+
+def chat_unavailable():
+    app.logger.error("GEMINI_API_KEY not found in environment variables")
+    return jsonify({"error": "Server Error: API Key not configured"}), 500
+
+def chat_busy():
+    response = jsonify({"error": "The assistant is busy right now. Please try again in a moment."})
+    response.headers['Retry-After'] = '2'
+    return response, 503
+
+def chat_message():
+    """The request's 'message' if it is a non-empty string, else None."""
+    data = request.get_json(silent=True)
+    message = data.get('message') if isinstance(data, dict) else None
+    return message if isinstance(message, str) and message.strip() else None
+
+def invalid_chat_message():
+    return jsonify({"error": "'message' must be a non-empty string."}), 400
+
+@app.route('/api/chat', methods=['POST'])
+def chat_proxy():
+    user_message = chat_message()
+    if user_message is None:
+        return invalid_chat_message()
+    if not gemini.configured:
+        return chat_unavailable()
+    cache_key = chat_cache_key(user_message)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        response = jsonify(cached)
+        response.headers['X-Cache'] = 'HIT'
+        return response
     try:
-        response = requests.post(URL, json=payload, headers={'Content-Type': 'application/json'})
-        if response.status_code != 200:
-            # This helps debugging if Google returns an error
-            return jsonify(response.json()), response.status_code
-        return jsonify(response.json())
+        with metrics.upstream_call('generateContent'):
+            body = gemini.generate(chat_payload(user_message))
+        # Only real answers are cached; errors and empty/blocked replies never are.
+        if response_text(body):
+            chat_cache.put(cache_key, body)
+        response = jsonify(body)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    except UpstreamBusy:
+        return chat_busy()
+    except UpstreamError as e:
+        # Pass Google's error through; it is what makes debugging possible.
+        return jsonify(e.body), e.status
+    except requests.Timeout:
+        return jsonify({"error": "The assistant took too long to answer."}), 504
     except Exception as e:
+        app.logger.exception("Chat proxy failed")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """Same as /api/chat, but relays the answer as Server-Sent Events while Gemini generates it."""
+    user_message = chat_message()
+    if user_message is None:
+        return invalid_chat_message()
+    if not gemini.configured:
+        return chat_unavailable()
+    cache_key = chat_cache_key(user_message)
+    cached = chat_cache.get(cache_key)
+    if cached is not None:
+        return chat_event_stream([response_text(cached)], cache_status='HIT')
+    try:
+        with metrics.upstream_call('streamGenerateContent'):
+            chunks = gemini.stream(chat_payload(user_message))
+    except UpstreamBusy:
+        return chat_busy()
+    except UpstreamError as e:
+        return jsonify(e.body), e.status
+    except requests.Timeout:
+        return jsonify({"error": "The assistant took too long to answer."}), 504
+    except Exception as e:
+        app.logger.exception("Chat stream failed")
+        return jsonify({"error": str(e)}), 500
+
+    response = chat_event_stream(chunks, cache_key=cache_key)
+    # Frees the upstream connection and slot even if the browser disconnects early.
+    response.call_on_close(chunks.close)
+    return response
+
+def chat_event_stream(chunks, cache_key=None, cache_status='MISS'):
+    """Relay text chunks as Server-Sent Events; a completed answer is cached under cache_key."""
+    def events():
+        parts = []
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield f"data: {json.dumps({'text': text})}\n\n"
+        except Exception as e:
+            app.logger.warning("Chat stream interrupted: %s", e)
+            yield f"event: error\ndata: {json.dumps({'error': 'The assistant stopped responding.'})}\n\n"
+            return
+        if cache_key and parts:
+            chat_cache.put(cache_key, cached_chat_body(''.join(parts)))
+        yield "event: done\ndata: {}\n\n"
+
+    response = Response(events(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['X-Cache'] = cache_status
+    return response
+
+# Superseded by ix_student_skill_skill_level.
+RETIRED_INDEXES = ('ix_student_skill_skill_id',)
+
+@app.cli.command('migrate-db')
+def migrate_db_command():
+    """Add missing columns and indexes to an existing database."""
+    steps = db_config.migrate_schema(db.engine, db.metadata, RETIRED_INDEXES)
+    print('\n'.join(steps) if steps else 'Schema is up to date.')
+
+@app.cli.command('rebuild-gap-summaries')
+def rebuild_gap_summaries_command():
+    """Recompute every dashboard gap summary from StudentSkill."""
+    print(f'Rebuilt {rebuild_gap_summaries()} gap summary rows.')
+
+@app.cli.command('check-gap-summaries')
+def check_gap_summaries_command():
+    """Report summaries that disagree with the live StudentSkill aggregate."""
+    mismatches = check_gap_summaries()
+    print('\n'.join(mismatches) if mismatches else 'All gap summaries match.')
+    if mismatches: raise SystemExit(1)
+
 # --- MAIN EXECUTION BLOCK ---
 with app.app_context():
     db.create_all()
+    db_config.migrate_schema(db.engine, db.metadata, RETIRED_INDEXES)
     seed_database()
+    # Backfill databases that predate the summary table.
+    if not SkillGapSummary.query.first() and StudentSkill.query.first():
+        rebuild_gap_summaries()
+    skill_catalog.get()
+    # After startup, so seeding and migration queries stay out of the numbers.
+    metrics.init_app(app, db.engine, chat_cache)
+app.config['STARTUP_SECONDS'] = time.perf_counter() - _import_started
+app.logger.info('SkillSync ready in %.0f ms', app.config['STARTUP_SECONDS'] * 1000)
 
 if __name__ == '__main__':
     app.run(debug=True) 
@@ -0,0 +1,106 @@
+"""Login-flood benchmark.
+
+Floods /login from several threads and, at the same time, keeps requesting
+an unrelated route (/) to see how much the hashing work slows everyone else
+down. Each mode is run against the same scratch database:
+
+    pool     hashes in the process pool (the production setup)
+    inline   hashes on the request thread (HASHING_WORKERS=0)
+
+Usage (from backend/):
+    python -m benchmarks.bench_login --threads 16 --seconds 5 --rounds 12
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.common import percentile, use_scratch_database
+
+
+def probe(client, stop, latencies):
+    while not stop.is_set():
+        started = time.perf_counter()
+        client.get('/')
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.01)
+
+
+def flood(app, email, password, stop, outcomes):
+    client = app.test_client()
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = client.post('/login', data={'email': email, 'password': password})
+        outcomes.append((response.status_code, (time.perf_counter() - started) * 1000))
+        if response.status_code == 503:
+            time.sleep(0.05)  # a real client backs off instead of spinning
+
+
+def run_mode(app_module, hasher, threads, seconds, email, password):
+    app_module.password_hasher = hasher
+    hasher.verify(hasher.hash(password), password)  # start the pool outside the timed window
+    app = app_module.app
+    stop = threading.Event()
+    latencies, outcomes = [], []
+    probe_client = app.test_client()
+    workers = [threading.Thread(target=flood, args=(app, email, password, stop, outcomes)) for _ in range(threads)]
+    workers.append(threading.Thread(target=probe, args=(probe_client, stop, latencies)))
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    logins = [ms for status, ms in outcomes if status == 302]
+    return {
+        'logins_per_sec': len(logins) / seconds,
+        'login_p99_ms': percentile(logins, 99),
+        'rejected_503': sum(1 for status, _ in outcomes if status == 503),
+        'probe_requests': len(latencies),
+        'probe_p50_ms': percentile(latencies, 50),
+        'probe_p99_ms': percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each mode')
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt cost factor')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='hashing processes in pool mode')
+    args = parser.parse_args()
+
+    use_scratch_database()
+    os.environ['BCRYPT_LOG_ROUNDS'] = str(args.rounds)
+    import app as app_module
+    from hashing import PasswordHasher
+
+    email, password = 'bench@skillsync.test', 'correct horse battery staple'
+    with app_module.app.app_context():
+        user = app_module.User(email=email, username='bench',
+                               password_hash=PasswordHasher(args.rounds, workers=0).hash(password))
+        app_module.db.session.add(user)
+        app_module.db.session.commit()
+
+    idle = []
+    client = app_module.app.test_client()
+    for _ in range(200):
+        started = time.perf_counter()
+        client.get('/')
+        idle.append((time.perf_counter() - started) * 1000)
+    print(f'idle  /  p50 {percentile(idle, 50):7.2f} ms   p99 {percentile(idle, 99):7.2f} ms')
+
+    modes = {
+        'pool': PasswordHasher(args.rounds, workers=args.workers),
+        'inline': PasswordHasher(args.rounds, workers=0, max_pending=args.threads),
+    }
+    for name, hasher in modes.items():
+        result = run_mode(app_module, hasher, args.threads, args.seconds, email, password)
+        hasher.shutdown()
+        print(f"{name:6} logins/sec {result['logins_per_sec']:7.1f}   login p99 {result['login_p99_ms']:8.1f} ms   "
+              f"503s {result['rejected_503']:5}   /  p50 {result['probe_p50_ms']:7.2f} ms   "
+              f"p99 {result['probe_p99_ms']:7.2f} ms   ({result['probe_requests']} probes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Route benchmark suite.
+
+Builds a throwaway database with synthetic students and reviews, then drives
+each route through the Flask test client and reports requests/sec, p50/p99
+latency and SQL statements per request. /api/chat talks to a local stub
+instead of Gemini. Results can be saved as JSON and compared with an earlier
+run to catch regressions.
+
+Usage (from backend/):
+    python -m benchmarks.bench_routes --users 1000 --feedback 5000 --requests 200 --out run.json
+    python -m benchmarks.bench_routes --compare run.json          # exits 1 on regression
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+from benchmarks.common import log_in, percentile, use_scratch_database
+
+
+def scenarios(app_module, rnd):
+    """(name, method, path, needs_login, request kwargs factory) for every benchmarked route."""
+    catalog = app_module.skill_catalog.get()
+    technical = catalog.in_category('Technical')
+    soft = catalog.in_category('Soft')
+    counter = iter(range(10 ** 9))
+    return [
+        ('home', 'GET', '/', False, lambda: {}),
+        ('feedback', 'GET', '/feedback.html', False, lambda: {}),
+        ('dashboard', 'GET', '/dashboard', True, lambda: {}),
+        ('technical_roadmap', 'GET', '/technical-roadmap.html', True, lambda: {}),
+        ('non_tech', 'GET', '/non-technical-activities.html', True, lambda: {}),
+        ('progress', 'GET', '/api/progress', True, lambda: {'query_string': {'category': 'Technical'}}),
+        ('save_skills', 'POST', '/save_skills', True,
+         lambda: {'data': {f'skill_{skill.id}': str(rnd.randint(1, 5)) for skill in technical}}),
+        ('mark_activity_complete', 'POST', '/mark_activity_complete', True,
+         lambda: {'json': {'skill_name': rnd.choice(soft).name}}),
+        ('chat_uncached', 'POST', '/api/chat', False,
+         lambda: {'json': {'message': f'Benchmark question {next(counter)}'}}),
+        ('chat_cached', 'POST', '/api/chat', False,
+         lambda: {'json': {'message': 'What is SkillSync?'}}),
+    ]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+def run_route(app_module, counter, user_ids, scenario, requests, warmup, rnd):
+    name, method, path, needs_login, make_kwargs = scenario
+    client = app_module.app.test_client()
+    latencies, statements, errors = [], 0, 0
+    for i in range(warmup + requests):
+        if needs_login:
+            log_in(client, rnd.choice(user_ids))
+        kwargs = make_kwargs()
+        counter.count = 0
+        started = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        if i < warmup:
+            continue
+        latencies.append(elapsed * 1000)
+        statements += counter.count
+        # A login-protected route bouncing to the register page means the request was never served.
+        if response.status_code >= 400 or (needs_login and '/register' in (response.location or '')):
+            errors += 1
+    return {
+        'requests': requests,
+        'rps': round(requests / (sum(latencies) / 1000), 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'sql_per_request': round(statements / requests, 2),
+        'errors': errors,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print a side-by-side table; return the list of regressions."""
+    regressions = []
+    print(f"\n{'route':24} {'p50 base':>9} {'p50 now':>9} {'p99 base':>9} {'p99 now':>9} {'sql base':>9} {'sql now':>8}")
+    for name, now in current['routes'].items():
+        base = baseline['routes'].get(name)
+        if base is None:
+            continue
+        print(f"{name:24} {base['p50_ms']:9.2f} {now['p50_ms']:9.2f} {base['p99_ms']:9.2f} {now['p99_ms']:9.2f} "
+              f"{base['sql_per_request']:9.2f} {now['sql_per_request']:8.2f}")
+        if now['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(f'{name}: p50 {base["p50_ms"]:.2f} -> {now["p50_ms"]:.2f} ms')
+        if now['sql_per_request'] > base['sql_per_request']:
+            regressions.append(f'{name}: SQL/request {base["sql_per_request"]} -> {now["sql_per_request"]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000, help='synthetic students')
+    parser.add_argument('--feedback', type=int, default=5000, help='synthetic reviews')
+    parser.add_argument('--requests', type=int, default=200, help='measured requests per route')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests per route')
+    parser.add_argument('--routes', help='comma-separated subset of route names')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed p50 slowdown before flagging (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    use_scratch_database()
+    from benchmarks.stub_gemini import start_stub
+    stub, stub_url = start_stub()
+    os.environ.update(GEMINI_API_KEY='benchmark', GEMINI_API_BASE=stub_url, HASHING_WORKERS='0')
+    os.environ.pop('CHAT_CACHE_PATH', None)
+
+    import app as app_module
+    from benchmarks.synthetic import populate
+
+    started = time.perf_counter()
+    user_ids = populate(app_module, args.users, args.feedback, args.seed)
+    print(f'Generated {args.users} students and {args.feedback} reviews in {time.perf_counter() - started:.1f} s')
+
+    # Requests must not share an outer app context: Flask-Login caches the user on g.
+    with app_module.app.app_context():
+        counter = StatementCounter(app_module.db.engine)
+        rnd = random.Random(args.seed)
+        all_scenarios = scenarios(app_module, rnd)
+    selected = set(args.routes.split(',')) if args.routes else None
+    results = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'users': args.users, 'feedback': args.feedback, 'requests': args.requests,
+            'python': sys.version.split()[0], 'sqlite': sqlite3.sqlite_version, 'platform': platform.platform(),
+        },
+        'routes': {},
+    }
+    print(f"\n{'route':24} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'SQL/req':>8} {'errors':>7}")
+    for scenario in all_scenarios:
+        if selected and scenario[0] not in selected:
+            continue
+        result = run_route(app_module, counter, user_ids, scenario, args.requests, args.warmup, rnd)
+        results['routes'][scenario[0]] = result
+        print(f"{scenario[0]:24} {result['rps']:8.1f} {result['p50_ms']:8.2f} {result['p99_ms']:8.2f} "
+              f"{result['sql_per_request']:8.2f} {result['errors']:7}")
+    stub.shutdown()
+
+    if args.out:
+        with open(args.out, 'w') as handle:
+            json.dump(results, handle, indent=2)
+        print(f'\nSaved results to {args.out}')
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        if regressions:
+            print('\nREGRESSIONS:\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+        print('\nNo regressions.')
+
+
+if __name__ == '__main__':
+    main()
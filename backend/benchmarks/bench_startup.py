@@ -0,0 +1,39 @@
+"""Startup benchmark: time from the first line of app.py to "ready".
+
+Each run imports ``app`` in a fresh interpreter against the same scratch
+database, the way a gunicorn worker boots. The first run creates and seeds
+the database; the rest are warm boots that should skip seeding entirely.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 10
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+from benchmarks.common import BACKEND_DIR, percentile, use_scratch_database
+
+PROBE = "import app; print(app.app.config['STARTUP_SECONDS'])"
+
+
+def boot_ms():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=os.environ,
+                            capture_output=True, text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='warm boots to time')
+    args = parser.parse_args()
+
+    use_scratch_database()
+    print(f'cold boot (create + seed)  {boot_ms():8.1f} ms')
+    warm = [boot_ms() for _ in range(args.runs)]
+    print(f'warm boot x{args.runs:<3}             p50 {percentile(warm, 50):8.1f} ms   '
+          f'max {max(warm):8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
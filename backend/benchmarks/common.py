@@ -0,0 +1,36 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks never touch ``instance/skillsync.db``: call ``use_scratch_database()``
+before importing ``app`` and everything runs against a throwaway SQLite file.
+"""
+import math
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def use_scratch_database():
+    """Point DATABASE_URL at a fresh temporary SQLite file and return its path."""
+    path = os.path.join(tempfile.mkdtemp(prefix='skillsync-bench-'), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    return path
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered)))) - 1
+    return ordered[rank]
+
+
+def log_in(client, user_id):
+    """Make a Flask test client act as ``user_id`` without going through /login."""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
@@ -0,0 +1,64 @@
+"""A local stand-in for the Gemini API, for benchmarks and manual testing.
+
+Answers generateContent with a canned reply and streamGenerateContent with a
+few SSE chunks, after an optional fixed delay, or every call with a fixed
+error status. Point the app at it with
+``GEMINI_API_BASE=<base_url>`` and any non-empty ``GEMINI_API_KEY``.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _reply(text):
+    return {'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive call.
+    disable_nagle_algorithm = True
+    delay = 0.0
+    status = 200
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        message = payload.get('contents', [{}])[0].get('parts', [{}])[0].get('text', '')
+        time.sleep(self.delay)
+        if self.status != 200:
+            body = json.dumps({'error': {'code': self.status, 'message': 'Stub error'}}).encode('utf-8')
+            self.send_response(self.status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if ':streamGenerateContent' in self.path:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for word in ('SkillSync', ' helps', ' you', ' close', ' skill', ' gaps.'):
+                event = f'data: {json.dumps(_reply(word))}\r\n\r\n'.encode('utf-8')
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(event), event))
+            self.wfile.write(b'0\r\n\r\n')
+            return
+        body = json.dumps(_reply(f'Stub answer to: {message}')).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub(delay=0.0, status=200):
+    """Serve the stub on a free localhost port; returns (server, base_url)."""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'delay': delay, 'status': status})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/v1beta'
@@ -0,0 +1,79 @@
+"""Synthetic data for benchmarks: N students with StudentSkill rows and M reviews.
+
+Every generated account shares the password ``benchmark`` (hashed once at
+cost 4), emails are ``student<i>@bench.skillsync.test``. Usage (from backend/):
+
+    python -m benchmarks.synthetic --users 1000 --feedback 5000
+
+prints the path of a throwaway SQLite database filled with that data.
+"""
+import argparse
+import random
+
+from benchmarks.common import use_scratch_database
+
+PASSWORD = 'benchmark'
+BATCH = 20000
+
+
+def populate(app_module, users=1000, feedback=1000, seed=1):
+    """Fill the database behind ``app_module`` and return the new user ids.
+
+    Each student rates every technical skill of two or three roadmaps plus
+    most soft skills, with random levels and completed-activity counts.
+    """
+    from sqlalchemy import insert
+    from hashing import PasswordHasher
+
+    rnd = random.Random(seed)
+    db = app_module.db
+    with app_module.app.app_context():
+        catalog = app_module.skill_catalog.get()
+        roadmaps = [group for group in catalog.by_roadmap_group if group != 'General']
+        soft = catalog.in_category('Soft')
+        password_hash = PasswordHasher(rounds=4, workers=0).hash(PASSWORD)
+
+        first_id = (db.session.query(db.func.max(app_module.User.id)).scalar() or 0) + 1
+        db.session.execute(insert(app_module.User), [
+            {'email': f'student{i}@bench.skillsync.test', 'username': f'student{i}', 'password_hash': password_hash}
+            for i in range(first_id, first_id + users)])
+        user_ids = list(range(first_id, first_id + users))
+
+        rows = []
+        for user_id in user_ids:
+            skills = [skill for group in rnd.sample(roadmaps, rnd.randint(2, 3)) for skill in catalog.by_roadmap_group[group]]
+            skills += [skill for skill in soft if rnd.random() < 0.8]
+            for skill in skills:
+                rows.append({'user_id': user_id, 'skill_id': skill.id, 'current_level': rnd.randint(1, 5),
+                             'completed_activities_count': rnd.choice((0, 0, 1, 2, 3, 5))})
+            if len(rows) >= BATCH:
+                db.session.execute(insert(app_module.StudentSkill), rows)
+                rows = []
+        if rows:
+            db.session.execute(insert(app_module.StudentSkill), rows)
+
+        for start in range(0, feedback, BATCH):
+            db.session.execute(insert(app_module.Feedback), [
+                {'student_name': f'Student {rnd.randint(1, 10 ** 6)}', 'rating': rnd.choice((3, 4, 4, 5, 5)),
+                 'message': 'Synthetic review ' * rnd.randint(1, 8)}
+                for _ in range(start, min(start + BATCH, feedback))])
+        db.session.commit()
+        app_module.rebuild_gap_summaries()
+    return user_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--feedback', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    path = use_scratch_database()
+    import app as app_module
+    populate(app_module, args.users, args.feedback, args.seed)
+    print(path)
+
+
+if __name__ == '__main__':
+    main()
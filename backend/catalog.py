@@ -0,0 +1,84 @@
+"""The SkillSync skill catalog: what gets seeded and the in-memory view routes read.
+
+The catalog barely changes after seeding, so each worker keeps an immutable
+SkillCatalog snapshot with O(1) lookups by id and name and ready-made
+groupings by roadmap and category, instead of querying Skill per request.
+"""
+import hashlib
+import json
+from types import MappingProxyType
+from typing import NamedTuple
+
+ROADMAP_DATA = {
+    'Web Developer': [{'name': 'HTML & CSS', 'industryNeed': 4}, {'name': 'JavaScript', 'industryNeed': 5}, {'name': 'Git & GitHub', 'industryNeed': 4}, {'name': 'Frontend Framework (React/Vue)', 'industryNeed': 5}, {'name': 'Backend Language (Python/Node)', 'industryNeed': 4}, {'name': 'Database (SQL/NoSQL)', 'industryNeed': 3}, {'name': 'APIs (RESTful)', 'industryNeed': 4}, {'name': 'Deployment (Cloud/Hosting)', 'industryNeed': 3}],
+    'Data Scientist': [{'name': 'Probability & Statistics', 'industryNeed': 4}, {'name': 'Python (Pandas, NumPy)', 'industryNeed': 5}, {'name': 'SQL', 'industryNeed': 4}, {'name': 'Data Cleaning & Preprocessing', 'industryNeed': 4}, {'name': 'Machine Learning', 'industryNeed': 5}, {'name': 'Data Visualization', 'industryNeed': 3}, {'name': 'Big Data (Spark/Hadoop)', 'industryNeed': 2}, {'name': 'Deployment (APIs/Cloud)', 'industryNeed': 3}],
+    'Cybersecurity Analyst': [{'name': 'Computer Fundamentals', 'industryNeed': 3}, {'name': 'Linux & Networking', 'industryNeed': 4}, {'name': 'Python for Automation', 'industryNeed': 3}, {'name': 'Security Tools (Nmap, Wireshark)', 'industryNeed': 4}, {'name': 'Web Security (OWASP)', 'industryNeed': 5}, {'name': 'Penetration Testing Basics', 'industryNeed': 4}, {'name': 'SOC/Blue Team Basics', 'industryNeed': 3}],
+    'App Developer': [{'name': 'Java or Kotlin', 'industryNeed': 4}, {'name': 'Android Studio', 'industryNeed': 4}, {'name': 'UI/UX basics', 'industryNeed': 3}, {'name': 'Android components', 'industryNeed': 4}, {'name': 'Databases (Room, SQLite)', 'industryNeed': 3}, {'name': 'API integration', 'industryNeed': 4}, {'name': 'Firebase', 'industryNeed': 3}],
+    'Cloud Engineer': [{'name': 'Linux basics', 'industryNeed': 3}, {'name': 'Networking (VPC, Subnets)', 'industryNeed': 4}, {'name': 'Cloud provider (AWS/Azure/GCP)', 'industryNeed': 5}, {'name': 'IAM', 'industryNeed': 4}, {'name': 'Compute (EC2, VM)', 'industryNeed': 5}, {'name': 'Storage (S3/Blob)', 'industryNeed': 3}, {'name': 'Databases (RDS, DynamoDB)', 'industryNeed': 3}, {'name': 'Monitoring & Security', 'industryNeed': 4}],
+    'AI/ML Engineer': [{'name': 'Python (Adv. Libraries)', 'industryNeed': 4}, {'name': 'Stats & Probability', 'industryNeed': 4}, {'name': 'ML Algorithms', 'industryNeed': 5}, {'name': 'Deep Learning (TensorFlow/PyTorch)', 'industryNeed': 5}, {'name': 'Data Engineering basics', 'industryNeed': 3}, {'name': 'NLP / CV', 'industryNeed': 4}, {'name': 'Deployment (Docker, APIs)', 'industryNeed': 4}],
+    'UI/UX Designer': [{'name': 'Design principles', 'industryNeed': 4}, {'name': 'Figma', 'industryNeed': 5}, {'name': 'Typography & Color Theory', 'industryNeed': 3}, {'name': 'Wireframes', 'industryNeed': 3}, {'name': 'Prototypes', 'industryNeed': 4}, {'name': 'User research', 'industryNeed': 4}, {'name': 'Portfolio building', 'industryNeed': 3}],
+    'Ethical Hacker': [{'name': 'Linux fundamentals', 'industryNeed': 4}, {'name': 'Networking basics', 'industryNeed': 4}, {'name': 'Security concepts (CIA triad, attacks)', 'industryNeed': 5}, {'name': 'Kali Linux tools', 'industryNeed': 5}, {'name': 'Vulnerability scanning', 'industryNeed': 4}, {'name': 'Metasploit basics', 'industryNeed': 3}, {'name': 'Reporting & documentation', 'industryNeed': 3}],
+    'Data Analyst': [{'name': 'Excel fundamentals', 'industryNeed': 4}, {'name': 'SQL basics (joins, subqueries)', 'industryNeed': 5}, {'name': 'Visualization tools (Power BI/Tableau)', 'industryNeed': 4}, {'name': 'Reports & dashboards', 'industryNeed': 3}, {'name': 'Basic analytics case studies', 'industryNeed': 3}],
+    'Full Stack Developer': [{'name': 'HTML & CSS', 'industryNeed': 4}, {'name': 'JavaScript', 'industryNeed': 5}, {'name': 'Frontend Framework (React/Vue)', 'industryNeed': 5}, {'name': 'Backend Language (Node.js / Python)', 'industryNeed': 4}, {'name': 'Database (SQL/NoSQL)', 'industryNeed': 4}, {'name': 'APIs + Authentication', 'industryNeed': 4}, {'name': 'Deployment (Render, Vercel, AWS)', 'industryNeed': 4}]
+}
+SOFT_SKILLS = ['Communication Skills', 'Time Management', 'Public Speaking', 'Teamwork Skills', 'Critical Thinking', 'Leadership Skills', 'Creativity', 'Problem Solving', 'Emotional Intelligence']
+ROADMAP_GROUPS = ["Web Developer", "Cybersecurity Analyst", "Ethical Hacker", "AI/ML Engineer", "Data Scientist", "Data Analyst", "Cloud Engineer", "UI/UX Designer", "Full Stack Developer"]
+
+ACTIVITIES = {
+    'Communication Skills': ['Record a 1-minute self-intro', 'Read aloud for 3 minutes', 'Talk to one new person', 'Write a professional email', 'Explain a concept in simple words'],
+    'Time Management': ['Track your day for 24 hours', 'Make a to-do list', 'Complete 1 task using Pomodoro', 'Set top 3 priorities for tomorrow', 'Track actual study hours'],
+    'Public Speaking': ['Speak in front of a mirror for 1 minute', 'Record a short speech', 'Ask 1 question in public', 'Present something to a friend', 'Watch a TED talk'],
+    'Teamwork Skills': ['Complete 1 task with a partner', 'Give positive feedback', 'Delegate a task', 'Resolve a small conflict', 'Do a group mini-project'],
+    'Critical Thinking': ['Solve 1 puzzle/riddle', 'Do a root-cause analysis', 'Break a problem into steps', 'Compare two solutions', 'Solve a small case study'],
+    'Leadership Skills': ['Lead a small project', 'Assign tasks based on strengths', 'Give corrective feedback', 'Take responsibility for an outcome', 'Mentor a junior student'],
+    'Creativity': ['Generate 5 ideas for a problem', 'Make a mind map', 'Sketch a rough design', 'Try a rapid prototype', 'Combine 2 random concepts'],
+    'Problem Solving': ['Solve a logic puzzle', 'Break a real-life issue into steps', 'Test a solution and improve', 'Analyze why something failed', 'Compare outcomes of approaches'],
+    'Emotional Intelligence': ['Maintain a mood journal', 'Do a 5-min breathing session', 'Practice active listening', 'Write a reflection on emotions', 'Observe someone’s emotion']
+}
+ICONS = {'Communication Skills': '🗣', 'Time Management': '🕒', 'Public Speaking': '🎤', 'Teamwork Skills': '👥', 'Critical Thinking': '🧠', 'Leadership Skills': '🧑‍🏫', 'Creativity': '💡', 'Problem Solving': '🧩', 'Emotional Intelligence': '❤️'}
+
+
+def catalog_rows():
+    """Skill rows the catalog defines; a name listed under several roadmaps keeps its first entry."""
+    rows = {}
+    for role, skills in ROADMAP_DATA.items():
+        for skill_data in skills:
+            rows.setdefault(skill_data['name'], {'name': skill_data['name'], 'category': 'Technical', 'industry_need_level': skill_data['industryNeed'], 'roadmap_group': role})
+    for name in SOFT_SKILLS:
+        rows.setdefault(name, {'name': name, 'category': 'Soft', 'industry_need_level': 5, 'roadmap_group': 'General'})
+    return list(rows.values())
+
+def catalog_version(rows):
+    return hashlib.sha256(json.dumps(rows, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class SkillRecord(NamedTuple):
+    id: int
+    name: str
+    category: str
+    industry_need_level: int
+    roadmap_group: str
+
+
+class SkillCatalog:
+    """Read-only snapshot of the Skill table, tagged with the catalog version it was loaded at."""
+
+    def __init__(self, records, version=None):
+        self.version = version
+        self.records = tuple(sorted(records, key=lambda record: record.id))
+        self.by_id = MappingProxyType({record.id: record for record in self.records})
+        self.by_name = MappingProxyType({record.name: record for record in self.records})
+        self.by_roadmap_group = self._group(lambda record: record.roadmap_group)
+        self.by_category = self._group(lambda record: record.category)
+
+    def _group(self, key):
+        groups = {}
+        for record in self.records:
+            groups.setdefault(key(record), []).append(record)
+        return MappingProxyType({name: tuple(members) for name, members in groups.items()})
+
+    def __len__(self):
+        return len(self.records)
+
+    def in_category(self, category):
+        return self.by_category.get(category, ())
@@ -0,0 +1,148 @@
+"""Response cache for the chat assistant.
+
+Answers are keyed on the normalized question plus the system instruction and
+model, so "What is SkillSync?" and "what is skillsync" share one entry. There
+are two tiers:
+
+* an in-process LRU with a fixed number of entries, and
+* an optional SQLite file shared by every gunicorn worker on the host.
+
+Both tiers honour the same TTL. Only successful answers should be stored;
+the caller decides what counts as one.
+
+    CHAT_CACHE_SIZE       in-process entries per worker (default: 256, 0 disables the cache)
+    CHAT_CACHE_TTL        seconds an answer stays valid (default: 3600)
+    CHAT_CACHE_PATH       SQLite file for the shared tier (default: unset, tier disabled)
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_message(message):
+    return _WHITESPACE.sub(' ', message).strip().lower().rstrip('?!. ')
+
+
+class SharedTier:
+    """Answers stored in a SQLite file so all workers can reuse them."""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS chat_cache '
+                         '(key TEXT PRIMARY KEY, body TEXT NOT NULL, expires_at REAL NOT NULL)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, now):
+        row = self._connect().execute(
+            'SELECT body, expires_at FROM chat_cache WHERE key = ? AND expires_at > ?', (key, now)).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def put(self, key, body, expires_at):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO chat_cache (key, body, expires_at) VALUES (?, ?, ?)',
+                         (key, json.dumps(body), expires_at))
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM chat_cache WHERE expires_at <= ?', (time.time(),))
+
+
+class ChatCache:
+    def __init__(self, max_entries=256, ttl=3600, shared_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared = SharedTier(shared_path) if shared_path else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'stores': 0,
+                         'evictions': 0, 'expirations': 0, 'shared_errors': 0}
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        return cls(max_entries=int(env('CHAT_CACHE_SIZE', 256)),
+                   ttl=float(env('CHAT_CACHE_TTL', 3600)),
+                   shared_path=env('CHAT_CACHE_PATH') or None)
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(message, system_instruction, model=''):
+        raw = '\x1f'.join((normalize_message(message), system_instruction, model))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _remember(self, key, body, expires_at):
+        with self._lock:
+            self._entries[key] = (body, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters['evictions'] += 1
+
+    def get(self, key):
+        """Return the cached body for ``key`` or None."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    return entry[0]
+                del self._entries[key]
+                self.counters['expirations'] += 1
+        if self.shared is not None:
+            try:
+                found = self.shared.get(key, now)
+            except sqlite3.Error:
+                found = None
+                self._count('shared_errors')
+            if found is not None:
+                self._remember(key, *found)
+                self._count('shared_hits')
+                return found[0]
+        self._count('misses')
+        return None
+
+    def put(self, key, body):
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl
+        self._remember(key, body, expires_at)
+        self._count('stores')
+        if self.shared is not None:
+            try:
+                self.shared.put(key, body, expires_at)
+            except sqlite3.Error:
+                self._count('shared_errors')
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, size=len(self._entries), capacity=self.max_entries)
@@ -0,0 +1,131 @@
+"""Database configuration for SkillSync.
+
+Everything here is driven by environment variables so the same code runs
+locally against ``instance/skillsync.db`` and under gunicorn in production:
+
+    DATABASE_URL              SQLAlchemy URL (default: sqlite:///skillsync.db)
+    DB_POOL_SIZE              connections kept open per worker (default: 5)
+    DB_MAX_OVERFLOW           extra connections allowed under burst (default: 10)
+    DB_POOL_TIMEOUT           seconds to wait for a pooled connection (default: 30)
+    DB_POOL_RECYCLE           seconds before a connection is replaced (default: 1800)
+    SQLITE_JOURNAL_MODE       default: WAL
+    SQLITE_SYNCHRONOUS        default: NORMAL
+    SQLITE_BUSY_TIMEOUT_MS    how long a writer waits for the lock (default: 5000)
+    SQLITE_MMAP_SIZE          bytes of the file to memory-map (default: 64 MiB)
+"""
+import logging
+import os
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.schema import CreateIndex
+
+log = logging.getLogger(__name__)
+
+DEFAULT_DATABASE_URL = 'sqlite:///skillsync.db'
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def database_url():
+    url = os.environ.get('DATABASE_URL') or DEFAULT_DATABASE_URL
+    # Render/Heroku still hand out the pre-SQLAlchemy-1.4 scheme.
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url):
+    if url.startswith('sqlite'):
+        # pysqlite's own busy handler; the PRAGMA below covers other drivers.
+        options = {'connect_args': {'timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000}}
+        if ':memory:' in url or url in ('sqlite://', 'sqlite:///'):
+            return options
+    else:
+        options = {'pool_pre_ping': True}
+    options.update({
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+    })
+    return options
+
+
+def configure_database(app):
+    """Fill in the Flask-SQLAlchemy settings from the environment."""
+    url = database_url()
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+
+
+def sqlite_pragmas():
+    return [
+        ('journal_mode', os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')),
+        ('synchronous', os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')),
+        ('busy_timeout', _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        ('mmap_size', _env_int('SQLITE_MMAP_SIZE', 64 * 1024 * 1024)),
+    ]
+
+
+def install_sqlite_pragmas(engine):
+    """Apply the connect-time PRAGMAs to every new SQLite connection of ``engine``."""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def _drop_duplicates(conn, table, columns):
+    """Keep the newest row per ``columns`` so a unique index can be built."""
+    pk = list(table.primary_key.columns)[0]
+    keep = select(func.max(pk)).group_by(*columns)
+    result = conn.execute(table.delete().where(pk.not_in(keep)))
+    if result.rowcount:
+        log.warning('Removed %d duplicate rows from %s before adding a unique index', result.rowcount, table.name)
+
+
+def migrate_schema(engine, metadata, retired_indexes=()):
+    """Bring an existing database up to the models without dropping data.
+
+    Adds nullable columns and indexes that ``create_all()`` skips on tables
+    that already exist, and drops the indexes named in ``retired_indexes``.
+    Safe to run on every start; returns the steps applied.
+    """
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    applied = []
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable or column.primary_key:
+                    continue
+                conn.exec_driver_sql(
+                    f'ALTER TABLE {preparer.format_table(table)} ADD COLUMN '
+                    f'{preparer.format_column(column)} {column.type.compile(dialect=engine.dialect)}')
+                applied.append(f'add column {table.name}.{column.name}')
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for name in existing_indexes.intersection(retired_indexes):
+                conn.exec_driver_sql(f'DROP INDEX IF EXISTS {preparer.quote(name)}')
+                applied.append(f'drop index {name}')
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                if index.unique:
+                    _drop_duplicates(conn, table, list(index.columns))
+                conn.execute(CreateIndex(index, if_not_exists=True))
+                applied.append(f'create index {index.name}')
+    for step in applied:
+        log.info('Schema migration: %s', step)
+    return applied
@@ -0,0 +1,166 @@
+"""Pooled, bounded HTTP client for the Gemini API used by the chat assistant.
+
+One client per worker process shares a keep-alive connection pool, applies
+connect/read timeouts to every call and caps how many upstream calls may be
+in flight at once, so slow generations cannot tie up every request thread.
+
+    GEMINI_API_KEY            API key (required for chat)
+    GEMINI_API_BASE           API root (default: the public v1beta endpoint)
+    GEMINI_MODEL              default: gemini-2.0-flash
+    GEMINI_CONNECT_TIMEOUT    seconds (default: 3.05)
+    GEMINI_READ_TIMEOUT       seconds between bytes (default: 30)
+    GEMINI_MAX_CONCURRENCY    upstream calls in flight per worker (default: 4)
+    GEMINI_ACQUIRE_TIMEOUT    seconds to wait for a free slot (default: 0.5)
+    GEMINI_POOL_SIZE          keep-alive connections per worker (default: 10)
+"""
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_API_BASE = 'https://generativelanguage.googleapis.com/v1beta'
+
+
+class UpstreamBusy(Exception):
+    """Every upstream slot is taken; the caller should answer 503."""
+
+
+class UpstreamError(Exception):
+    """Gemini answered with a non-200 status."""
+
+    def __init__(self, status, body):
+        super().__init__(f'Gemini returned HTTP {status}')
+        self.status = status
+        self.body = body
+
+
+def _body(response):
+    try:
+        return response.json()
+    except ValueError:
+        return {'error': response.text}
+
+
+def response_text(body):
+    """Concatenated text of the first candidate in a (streamed or full) response body."""
+    candidates = body.get('candidates') or [{}]
+    parts = (candidates[0].get('content') or {}).get('parts') or []
+    return ''.join(part.get('text', '') for part in parts)
+
+
+class TextStream:
+    """Iterator over the text of a streamGenerateContent response.
+
+    Holds one concurrency slot until it is exhausted or closed; ``close()``
+    is idempotent so it can be registered as a response close callback.
+    """
+
+    def __init__(self, response, release):
+        self._response = response
+        self._release = release
+        self._lines = response.iter_lines(decode_unicode=True)
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        try:
+            for line in self._lines:
+                if not line or not line.startswith('data:'):
+                    continue
+                text = response_text(json.loads(line[len('data:'):]))
+                if text:
+                    return text
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        raise StopIteration
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._response.close()
+            self._release()
+
+
+class GeminiClient:
+    def __init__(self, api_key, base_url=DEFAULT_API_BASE, model='gemini-2.0-flash',
+                 connect_timeout=3.05, read_timeout=30.0, max_concurrency=4,
+                 acquire_timeout=0.5, pool_size=10):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        return cls(
+            api_key=env('GEMINI_API_KEY'),
+            base_url=env('GEMINI_API_BASE', DEFAULT_API_BASE),
+            model=env('GEMINI_MODEL', 'gemini-2.0-flash'),
+            connect_timeout=float(env('GEMINI_CONNECT_TIMEOUT', 3.05)),
+            read_timeout=float(env('GEMINI_READ_TIMEOUT', 30)),
+            max_concurrency=int(env('GEMINI_MAX_CONCURRENCY', 4)),
+            acquire_timeout=float(env('GEMINI_ACQUIRE_TIMEOUT', 0.5)),
+            pool_size=int(env('GEMINI_POOL_SIZE', 10)),
+        )
+
+    @property
+    def configured(self):
+        return bool(self.api_key)
+
+    def _url(self, method):
+        return f'{self.base_url}/models/{self.model}:{method}'
+
+    def _headers(self):
+        return {'Content-Type': 'application/json', 'x-goog-api-key': self.api_key}
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise UpstreamBusy()
+
+    def generate(self, payload):
+        """Call generateContent; returns the parsed body or raises UpstreamError."""
+        self._acquire()
+        try:
+            response = self.session.post(self._url('generateContent'), json=payload,
+                                         headers=self._headers(), timeout=self.timeout)
+            body = _body(response)
+        finally:
+            self._slots.release()
+        if response.status_code != 200:
+            raise UpstreamError(response.status_code, body)
+        return body
+
+    def stream(self, payload):
+        """Start a streamGenerateContent call and return a TextStream.
+
+        Busy, transport and HTTP errors are raised here, before any text is
+        produced, so the caller can still answer with a plain error status.
+        """
+        self._acquire()
+        try:
+            response = self.session.post(self._url('streamGenerateContent') + '?alt=sse', json=payload,
+                                         headers=self._headers(), timeout=self.timeout, stream=True)
+        except BaseException:
+            self._slots.release()
+            raise
+        if response.status_code != 200:
+            body = _body(response)
+            response.close()
+            self._slots.release()
+            raise UpstreamError(response.status_code, body)
+        return TextStream(response, self._slots.release)
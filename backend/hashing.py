@@ -0,0 +1,119 @@
+"""Password hashing off the request thread.
+
+bcrypt is deliberately slow, so hashes are computed in a small process pool
+instead of on the gunicorn request thread. The number of jobs queued or
+running is capped; once the cap is reached new jobs are refused with
+HashingBusy and the route answers 503 rather than letting a login burst
+stall every other request. Pool processes start from a fork server, so a
+script that imports ``app`` must keep its own work under
+``if __name__ == '__main__':``.
+
+    BCRYPT_LOG_ROUNDS       cost factor for new hashes (default: 12)
+    HASHING_WORKERS         pool processes per worker (default: CPU count / WEB_CONCURRENCY, 0 hashes inline)
+    HASHING_MAX_PENDING     jobs queued or running before refusing (default: 4 per pool process)
+    HASHING_TIMEOUT         seconds to wait for one result (default: 10)
+
+Every gunicorn worker has its own pool and its own pending cap. The default
+splits the host's CPUs across WEB_CONCURRENCY (gunicorn's worker count), so
+the host as a whole runs about one bcrypt job per CPU. When the worker
+count is set some other way, set HASHING_WORKERS to match.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+import bcrypt
+
+
+class HashingBusy(Exception):
+    """Too many hashes pending, or one took too long; the caller should answer 503."""
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(hashed, password):
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    except ValueError:
+        return False
+
+
+def hash_cost(hashed):
+    """Cost factor of a ``$2b$12$...`` hash, or None if it is not a bcrypt hash."""
+    parts = hashed.split('$')
+    return int(parts[2]) if len(parts) > 3 and parts[2].isdigit() else None
+
+
+def default_workers():
+    """This web worker's share of the host CPUs, at least one."""
+    web_workers = int(os.environ.get('WEB_CONCURRENCY') or 1)
+    return max(1, (os.cpu_count() or 1) // max(web_workers, 1))
+
+
+class PasswordHasher:
+    def __init__(self, rounds=12, workers=None, max_pending=None, timeout=10.0):
+        self.rounds = rounds
+        self.workers = default_workers() if workers is None else workers
+        self.max_pending = max_pending or 4 * max(self.workers, 1)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_pid = None
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        workers = env('HASHING_WORKERS')
+        max_pending = env('HASHING_MAX_PENDING')
+        return cls(rounds=int(env('BCRYPT_LOG_ROUNDS', 12)),
+                   workers=int(workers) if workers else None,
+                   max_pending=int(max_pending) if max_pending else None,
+                   timeout=float(env('HASHING_TIMEOUT', 10)))
+
+    def _pool(self):
+        # Created lazily and per process, so a pool is never inherited across a fork.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        if self.workers == 0:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy() from None
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, hashed, password):
+        return self._run(_check, hashed, password)
+
+    def needs_rehash(self, hashed):
+        return hash_cost(hashed) != self.rounds
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,291 @@
+"""Request, SQL and upstream timing, served in Prometheus text format at /metrics.
+
+Nothing is installed unless METRICS_ENABLED is set: no request hooks, no
+SQLAlchemy listeners and no /metrics route, so a disabled build pays one
+attribute check per chat call and nothing else.
+
+Every gunicorn worker keeps its own numbers and writes them to
+``METRICS_DIR/metrics-<master pid>-<worker pid>.json``, at most once per
+METRICS_FLUSH_SECONDS. Whichever worker answers the scrape sums the files
+written under its master, so the totals cover every worker. Counters of
+workers that have exited still count, because they are totals; their gauges
+do not.
+
+    METRICS_ENABLED          1 to turn instrumentation on (default: off)
+    METRICS_DIR              where workers write snapshots (default: <tmp>/skillsync-metrics)
+    METRICS_FLUSH_SECONDS    how stale another worker's numbers may be (default: 5)
+    SLOW_QUERY_MS            log statements slower than this (default: 250)
+"""
+import atexit
+import bisect
+import contextlib
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import requests
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+from gemini_client import UpstreamBusy, UpstreamError
+
+log = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DESCRIPTIONS = {
+    'skillsync_http_requests_total': ('counter', 'Requests served, by endpoint, method and status.'),
+    'skillsync_http_request_duration_seconds': ('histogram', 'Time from request start to response headers.'),
+    'skillsync_db_statements_total': ('counter', 'SQL statements executed, by the endpoint that issued them.'),
+    'skillsync_db_statement_duration_seconds': ('histogram', 'SQL statement execution time.'),
+    'skillsync_db_slow_statements_total': ('counter', 'SQL statements slower than SLOW_QUERY_MS.'),
+    'skillsync_gemini_requests_total': ('counter', 'Upstream Gemini calls, by method and outcome.'),
+    'skillsync_gemini_request_duration_seconds': ('histogram', 'Upstream Gemini call time, to the first byte for streams.'),
+    'skillsync_chat_cache_events_total': ('counter', 'Chat cache lookups and maintenance, by event.'),
+    'skillsync_chat_cache_entries': ('gauge', 'Answers held in the in-process chat cache.'),
+}
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def chat_cache_samples(stats):
+    """(kind, name, labels, value) samples for a ChatCache.stats() dict."""
+    samples = [('gauge', 'skillsync_chat_cache_entries', (), stats['size'])]
+    for name, value in stats.items():
+        if name not in ('size', 'capacity'):
+            samples.append(('counter', 'skillsync_chat_cache_events_total', (('event', name),), value))
+    return samples
+
+
+class UpstreamTimer:
+    """Times one Gemini call and counts its outcome by the exception it ends with."""
+
+    def __init__(self, metrics, method):
+        self.metrics = metrics
+        self.method = method
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            status = '200'
+        elif issubclass(exc_type, UpstreamBusy):
+            status = 'busy'
+        elif issubclass(exc_type, UpstreamError):
+            status = str(exc.status)
+        elif issubclass(exc_type, requests.Timeout):
+            status = 'timeout'
+        else:
+            status = 'error'
+        self.metrics.inc('skillsync_gemini_requests_total', (('method', self.method), ('status', status)))
+        # A refused call never reached Gemini; its wait for a slot is not upstream latency.
+        if status != 'busy':
+            self.metrics.observe('skillsync_gemini_request_duration_seconds', (('method', self.method),),
+                                 time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=False, directory=None, flush_seconds=5.0, slow_query_seconds=0.25):
+        self.enabled = enabled
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'skillsync-metrics')
+        self.flush_seconds = flush_seconds
+        self.slow_query_seconds = slow_query_seconds
+        self._collectors = []
+        self._reset()
+        # With --preload the master's numbers would otherwise be counted once per worker.
+        os.register_at_fork(after_in_child=self._reset)
+
+    @classmethod
+    def from_env(cls):
+        env = os.environ.get
+        return cls(
+            enabled=env('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes', 'on'),
+            directory=env('METRICS_DIR') or None,
+            flush_seconds=float(env('METRICS_FLUSH_SECONDS', 5)),
+            slow_query_seconds=float(env('SLOW_QUERY_MS', 250)) / 1000,
+        )
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._flushed_at = 0.0
+
+    def init_app(self, app, engine, chat_cache=None):
+        """Install the request hooks, SQL listeners and /metrics route, if enabled."""
+        if not self.enabled:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._prune()
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+        if chat_cache is not None:
+            self._collectors.append(lambda: chat_cache_samples(chat_cache.stats()))
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        atexit.register(self.flush)
+
+    # --- recording ---
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, labels, seconds):
+        key = (name, labels)
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+
+    def upstream_call(self, method):
+        """Context manager around one Gemini call; a no-op when disabled."""
+        return UpstreamTimer(self, method) if self.enabled else contextlib.nullcontext()
+
+    def _start_request(self):
+        g._metrics_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            endpoint = request.endpoint or 'unmatched'
+            self.observe('skillsync_http_request_duration_seconds',
+                         (('endpoint', endpoint), ('method', request.method)), time.perf_counter() - started)
+            self.inc('skillsync_http_requests_total',
+                     (('endpoint', endpoint), ('method', request.method), ('status', str(response.status_code))))
+        if time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+        return response
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        endpoint = (request.endpoint or 'unmatched') if has_request_context() else 'none'
+        labels = (('endpoint', endpoint),)
+        self.inc('skillsync_db_statements_total', labels)
+        self.observe('skillsync_db_statement_duration_seconds', labels, elapsed)
+        if elapsed >= self.slow_query_seconds:
+            self.inc('skillsync_db_slow_statements_total', labels)
+            log.warning('Slow query (%.1f ms) in %s: %s', elapsed * 1000, endpoint, ' '.join(statement.split())[:500])
+
+    # --- sharing between workers ---
+
+    def _path(self, pid):
+        return os.path.join(self.directory, f'metrics-{os.getppid()}-{pid}.json')
+
+    def _prune(self):
+        """Remove snapshots left behind by masters that are no longer running."""
+        for path in glob.glob(os.path.join(self.directory, 'metrics-*-*.json')):
+            master = os.path.basename(path).split('-')[1]
+            if master.isdigit() and int(master) != os.getppid() and not _alive(int(master)):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+
+    def snapshot(self):
+        with self._lock:
+            counters = [[name, labels, value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, labels, list(buckets), total]
+                          for (name, labels), (buckets, total) in self._histograms.items()]
+        gauges = []
+        for collector in self._collectors:
+            for kind, name, labels, value in collector():
+                (gauges if kind == 'gauge' else counters).append([name, labels, value])
+        return {'pid': os.getpid(), 'counters': counters, 'histograms': histograms, 'gauges': gauges}
+
+    def flush(self):
+        """Write this worker's snapshot; skipped if another thread is already writing it."""
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        path = self._path(os.getpid())
+        try:
+            self._flushed_at = time.monotonic()
+            with open(f'{path}.tmp', 'w') as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(f'{path}.tmp', path)
+        except OSError:
+            log.warning('Could not write metrics snapshot %s', path, exc_info=True)
+        finally:
+            self._flush_lock.release()
+
+    def aggregate(self):
+        """Sum the snapshots of every worker under this master."""
+        self.flush()
+        counters, histograms, gauges = {}, {}, {}
+        for path in glob.glob(self._path('*')):
+            try:
+                with open(path) as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, buckets, total in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [[0] * len(buckets), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+                merged[1] += total
+            if _alive(snapshot['pid']):
+                for name, labels, value in snapshot['gauges']:
+                    key = (name, tuple(map(tuple, labels)))
+                    gauges[key] = gauges.get(key, 0) + value
+        return counters, histograms, gauges
+
+    def render(self):
+        counters, histograms, gauges = self.aggregate()
+        samples = {}
+        for (name, labels), value in sorted(counters.items()) + sorted(gauges.items()):
+            samples.setdefault(name, []).append(f'{name}{_format_labels(labels)} {value}')
+        for (name, labels), (buckets, total) in sorted(histograms.items()):
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", bound),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        output = []
+        for name in sorted(samples):
+            kind, description = DESCRIPTIONS.get(name, ('untyped', name))
+            output += [f'# HELP {name} {description}', f'# TYPE {name} {kind}'] + samples[name]
+        return '\n'.join(output) + '\n'
+
+    def metrics_view(self):
+        return Response(self.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,41 @@
+"""Tests run against a throwaway SQLite file, never ``instance/skillsync.db``."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# app configures and seeds its database at import time, so this has to come first.
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='skillsync-test-'), 'test.db')
+os.environ['HASHING_WORKERS'] = '0'
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app
+    return app
+
+
+@pytest.fixture
+def student(app_module):
+    """A fresh user id, with no StudentSkill rows."""
+    with app_module.app.app_context():
+        name = f'student-{os.urandom(4).hex()}'
+        user = app_module.User(email=f'{name}@test.skillsync', username=name, password_hash='unused')
+        app_module.db.session.add(user)
+        app_module.db.session.commit()
+        return user.id
+
+
+@pytest.fixture
+def client(app_module, student):
+    """A test client logged in as ``student``."""
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(student)
+        session['_fresh'] = True
+    return client
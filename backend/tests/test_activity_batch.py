@@ -0,0 +1,33 @@
+import pytest
+
+
+def soft_skill(app_module):
+    with app_module.app.app_context():
+        return app_module.skill_catalog.get().in_category('Soft')[0]
+
+
+@pytest.mark.parametrize('event', [
+    {'skill_id': True},
+    {'skill_id': True, 'count': True},
+    {'skill_name': 'No such skill'},
+    {'skill_name': ['list']},
+])
+def test_invalid_events_are_reported_as_unknown(client, event):
+    response = client.post('/mark_activity_complete/batch', json={'events': [event]})
+    assert response.status_code == 200
+    assert response.get_json()['unknown'] == [event]
+    assert response.get_json()['skills'] == []
+
+
+@pytest.mark.parametrize('count', [True, 0, -1, 1.5, '2', 6, 1000000, 10 ** 20])
+def test_count_must_be_a_positive_integer(app_module, client, count):
+    event = {'skill_name': soft_skill(app_module).name, 'count': count}
+    response = client.post('/mark_activity_complete/batch', json={'events': [event]})
+    assert response.get_json()['unknown'] == [event]
+
+
+def test_counts_are_summed_per_skill(app_module, client):
+    skill = soft_skill(app_module)
+    events = [{'skill_id': skill.id, 'count': 2}, {'skill_name': skill.name}]
+    skills = client.post('/mark_activity_complete/batch', json={'events': events}).get_json()['skills']
+    assert [(entry['skill_id'], entry['count']) for entry in skills] == [(skill.id, 3)]
@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy import insert
+
+import analytics
+
+
+@pytest.mark.parametrize('histogram, expected', [
+    ({value: 1 for value in range(1, 11)}, {10: 1, 25: 3, 50: 5, 75: 8, 90: 9}),
+    ({-2: 1, 0: 1, 3: 2}, {10: -2, 25: -2, 50: 0, 75: 3, 90: 3}),
+    ({0: 90, 4: 10}, {10: 0, 25: 0, 50: 0, 75: 0, 90: 0}),
+    ({0: 89, 4: 11}, {10: 0, 25: 0, 50: 0, 75: 0, 90: 4}),
+    ({2: 7}, {10: 2, 25: 2, 50: 2, 75: 2, 90: 2}),
+])
+def test_histogram_percentiles_use_nearest_rank(histogram, expected):
+    assert {pct: analytics.histogram_percentile(histogram, pct) for pct in analytics.PERCENTILES} == expected
+
+
+def test_histogram_percentile_of_empty_histogram_is_none():
+    assert analytics.histogram_percentile({}, 50) is None
+
+
+def test_gap_stats_as_dict():
+    stats = analytics.GapStats()
+    stats.add(2, rows=3, started=1, completed=4)
+    stats.add(-1, rows=1, started=1, completed=1)
+    assert stats.as_dict() == {
+        'rows': 4,
+        'gap': {'mean': 1.25, 'percentiles': {'p10': -1, 'p25': -1, 'p50': 2, 'p75': 2, 'p90': 2},
+                'histogram': {'-1': 1, '2': 3}},
+        'completion_rate': 0.5,
+        'avg_completed_activities': 1.25,
+    }
+
+
+@pytest.fixture
+def cohort(app_module):
+    """Empties StudentSkill; returns add(rows) for (user_id, skill_id, level, completed) tuples."""
+    db = app_module.db
+    with app_module.app.app_context():
+        db.session.query(app_module.StudentSkill).delete()
+        db.session.commit()
+
+    def add(rows):
+        with app_module.app.app_context():
+            db.session.execute(insert(app_module.StudentSkill), [
+                {'user_id': user_id, 'skill_id': skill_id, 'current_level': level, 'completed_activities_count': completed}
+                for user_id, skill_id, level, completed in rows])
+            db.session.commit()
+
+    yield add
+    with app_module.app.app_context():
+        app_module.rebuild_gap_summaries()
+
+
+@pytest.fixture
+def staff_client(app_module, client, student, monkeypatch):
+    with app_module.app.app_context():
+        email = app_module.db.session.get(app_module.User, student).email
+    monkeypatch.setitem(app_module.app.config, 'STAFF_EMAILS', {email})
+    return client
+
+
+def test_cohort_report_is_staff_only(client):
+    assert client.get('/api/analytics/cohort').status_code == 403
+    assert client.get('/api/analytics/export').status_code == 403
+
+
+def test_cohort_report_per_group(app_module, staff_client, student, cohort):
+    with app_module.app.app_context():
+        catalog = app_module.skill_catalog.get()
+    groups = [group for group in sorted(catalog.by_roadmap_group) if group != 'General'][:2]
+    first, second = (catalog.by_roadmap_group[group][:2] for group in groups)
+    rows = [
+        (student, first[0].id, 1, 0), (student, first[1].id, first[1].industry_need_level, 3),
+        (student, second[0].id, 2, 1),
+    ]
+    cohort(rows)
+
+    report = staff_client.get('/api/analytics/cohort').get_json()
+    assert report['overall']['rows'] == 3
+    assert set(report['groups']) == set(groups)
+
+    first_report = report['groups'][groups[0]]
+    assert first_report['gap']['mean'] == round((first[0].industry_need_level - 1) / 2, 3)
+    assert first_report['completion_rate'] == 0.5
+    assert first_report['avg_completed_activities'] == 1.5
+    # The skill with the larger gap leads the lagging list.
+    assert [skill['skill_id'] for skill in first_report['lagging_skills']] == [first[0].id, first[1].id]
+    assert first_report['lagging_skills'][1]['mean_gap'] == 0
+
+    second_report = report['groups'][groups[1]]
+    assert second_report['gap']['mean'] == second[0].industry_need_level - 2
+    assert second_report['completion_rate'] == 1.0
+
+    only_second = staff_client.get('/api/analytics/cohort', query_string={'roadmap_group': groups[1]}).get_json()
+    assert list(only_second['groups']) == [groups[1]]
+
+
+def test_export_streams_every_row_across_flushes(app_module, staff_client, student, cohort):
+    with app_module.app.app_context():
+        users = [app_module.User(email=f'export{i}@test.skillsync', username=f'export, "{i}"', password_hash='-')
+                 for i in range(40)]
+        app_module.db.session.add_all(users)
+        app_module.db.session.commit()
+        user_ids = [user.id for user in users]
+        skills = app_module.skill_catalog.get().in_category('Technical')
+    cohort([(user_id, skill.id, 1 + (user_id + skill.id) % 5, skill.id % 3) for user_id in user_ids for skill in skills])
+    with app_module.app.app_context():
+        total = app_module.StudentSkill.query.count()
+    assert total * 50 > 65536, 'not enough rows to cross a CSV flush'
+
+    response = staff_client.get('/api/analytics/export')
+    assert response.status_code == 200
+    chunks = list(response.response)
+    assert len(chunks) > 1
+    records = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert tuple(records[0]) == analytics.EXPORT_COLUMNS
+    assert len(records) - 1 == total
+    assert {record[1] for record in records[1:]} == {f'export, "{i}"' for i in range(40)}
+
+    lines = staff_client.get('/api/analytics/export', query_string={'format': 'jsonl'}).get_data(as_text=True).splitlines()
+    assert len(lines) == total
+    assert json.loads(lines[0])['gap'] == json.loads(lines[0])['industry_need_level'] - json.loads(lines[0])['current_level']
+
+
+def test_csv_and_jsonl_lines_keep_every_record_across_chunks():
+    records = [(i, f'user{i}', i % 7, 'Skill', 'Group', 5, i % 5, 5 - i % 5, i % 3) for i in range(5000)]
+    chunks = list(analytics.csv_lines(iter(records)))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 65536 + 200 for chunk in chunks)
+    assert len(list(csv.reader(io.StringIO(''.join(chunks))))) == len(records) + 1
+
+    chunks = list(analytics.jsonl_lines(iter(records)))
+    assert len(chunks) == 5
+    assert sum(chunk.count('\n') for chunk in chunks) == len(records)
+    assert list(analytics.jsonl_lines(iter([]))) == []
@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', ['/api/chat', '/api/chat/stream'])
+@pytest.mark.parametrize('body', [{'message': 5}, {'message': None}, {'message': '   '}, {}, ['hi'], 'hi'])
+def test_rejects_missing_or_non_string_message(app_module, path, body):
+    response = app_module.app.test_client().post(path, json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+@pytest.mark.parametrize('path', ['/api/chat', '/api/chat/stream'])
+def test_rejects_non_json_body(app_module, path):
+    response = app_module.app.test_client().post(path, data='message=hi')
+    assert response.status_code == 400
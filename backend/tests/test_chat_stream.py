@@ -0,0 +1,68 @@
+import pytest
+
+from benchmarks.stub_gemini import start_stub
+from chat_cache import ChatCache
+from gemini_client import GeminiClient
+
+
+@pytest.fixture
+def chat_client(app_module, monkeypatch):
+    """Returns make(delay, status, **env): a test client whose Gemini calls go to a fresh stub."""
+    servers = []
+
+    def make(delay=0.0, status=200, **env):
+        server, base_url = start_stub(delay, status)
+        servers.append(server)
+        monkeypatch.setenv('GEMINI_API_KEY', 'test')
+        monkeypatch.setenv('GEMINI_API_BASE', base_url)
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        monkeypatch.setattr(app_module, 'gemini', GeminiClient.from_env())
+        monkeypatch.setattr(app_module, 'chat_cache', ChatCache(max_entries=0))
+        return app_module.app.test_client()
+
+    yield make
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def ask(client, message='What is SkillSync?'):
+    return client.post('/api/chat/stream', json={'message': message})
+
+
+def test_relays_chunks_and_ends_with_done(chat_client):
+    response = ask(chat_client())
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert body.count('data: {"text"') == 6
+    assert body.endswith('event: done\ndata: {}\n\n')
+
+
+def test_passes_upstream_error_status_through(chat_client):
+    response = ask(chat_client(status=429))
+    assert response.status_code == 429
+    assert response.get_json()['error']['message'] == 'Stub error'
+
+
+def test_busy_when_every_slot_is_taken_and_free_again_after_close(app_module, chat_client):
+    client = chat_client(GEMINI_MAX_CONCURRENCY=1, GEMINI_ACQUIRE_TIMEOUT=0.05)
+    # Not read yet, so the stream still holds the only upstream slot.
+    holding = ask(client, 'first')
+    assert holding.status_code == 200
+
+    busy = ask(client, 'second')
+    assert busy.status_code == 503
+    assert busy.headers['Retry-After'] == '2'
+
+    # Closing early, as a disconnecting browser does, must hand the slot back.
+    holding.close()
+    again = ask(client, 'third')
+    assert again.status_code == 200
+    assert again.get_data(as_text=True).endswith('event: done\ndata: {}\n\n')
+
+
+def test_gateway_timeout_when_upstream_is_too_slow(chat_client):
+    response = ask(chat_client(delay=0.5, GEMINI_READ_TIMEOUT=0.1))
+    assert response.status_code == 504
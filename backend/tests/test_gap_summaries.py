@@ -0,0 +1,53 @@
+import threading
+
+
+def catalog(app_module):
+    with app_module.app.app_context():
+        return app_module.skill_catalog.get()
+
+
+def log_in(app_module, user_id):
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+def mismatches(app_module):
+    with app_module.app.app_context():
+        return app_module.check_gap_summaries()
+
+
+def test_summaries_match_after_mixed_writes(app_module, client):
+    technical, soft = catalog(app_module).in_category('Technical'), catalog(app_module).in_category('Soft')
+    batch = '/mark_activity_complete/batch'
+
+    client.post('/save_skills', data={f'skill_{skill.id}': '2' for skill in technical[:6]})
+    client.post(batch, json={'events': [{'skill_id': technical[0].id, 'count': 4}, {'skill_name': soft[0].name}]})
+    client.post('/save_skills', data={f'skill_{skill.id}': '4' for skill in technical[3:10]})
+    client.post('/mark_activity_complete', json={'skill_name': soft[1].name})
+    client.post(batch, json={'events': [{'skill_id': soft[0].id, 'count': 5}, {'skill_id': technical[9].id, 'count': 5}]})
+    assert mismatches(app_module) == []
+
+
+def test_summaries_match_after_concurrent_writes_for_one_user(app_module, student):
+    technical, soft = catalog(app_module).in_category('Technical'), catalog(app_module).in_category('Soft')
+    errors = []
+
+    def save(level):
+        response = log_in(app_module, student).post(
+            '/save_skills', data={f'skill_{skill.id}': str(level) for skill in technical[:8]})
+        if response.status_code != 302: errors.append(response.status_code)
+
+    def complete(skill):
+        response = log_in(app_module, student).post(
+            '/mark_activity_complete/batch', json={'events': [{'skill_id': skill.id, 'count': 2}]})
+        if response.status_code != 200: errors.append(response.status_code)
+
+    threads = [threading.Thread(target=save, args=(1 + i % 5,)) for i in range(6)]
+    threads += [threading.Thread(target=complete, args=(skill,)) for skill in technical[4:10] + soft[:4]]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert errors == []
+    assert mismatches(app_module) == []
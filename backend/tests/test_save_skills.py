@@ -0,0 +1,48 @@
+from sqlalchemy import event
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def technical_skills(app_module):
+    with app_module.app.app_context():
+        return app_module.skill_catalog.get().in_category('Technical')
+
+
+def save(app_module, client, skills, level):
+    with app_module.app.app_context():
+        engine = app_module.db.engine
+    with StatementCounter(engine) as counter:
+        response = client.post('/save_skills', data={f'skill_{skill.id}': str(level) for skill in skills})
+    assert response.status_code == 302
+    return counter.count
+
+
+def test_statement_count_does_not_grow_with_submitted_skills(app_module, client):
+    skills = technical_skills(app_module)
+    counts = {size: save(app_module, client, skills[:size], 3) for size in (1, 10, len(skills))}
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_resubmitting_updates_levels_in_place(app_module, client, student):
+    skills = technical_skills(app_module)
+    first = save(app_module, client, skills, 2)
+    second = save(app_module, client, skills, 4)
+    assert first == second
+    with app_module.app.app_context():
+        rows = app_module.StudentSkill.query.filter_by(user_id=student).all()
+    assert len(rows) == len(skills)
+    assert {row.current_level for row in rows} == {4}